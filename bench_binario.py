@@ -0,0 +1,101 @@
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+from dash import Patch
+from plotly.io.json import to_json_plotly
+
+
+def medir(construir, repeticiones):
+    """Median encode time, payload bytes and JSON parse time of what a callback returns"""
+    codificar, parsear = [], []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        texto = to_json_plotly(construir())
+        codificar.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        json.loads(texto)
+        parsear.append(time.perf_counter() - t0)
+    return {"bytes": len(texto.encode("utf-8")),
+            "codificar_s": round(statistics.median(codificar), 6),
+            "parsear_s": round(statistics.median(parsear), 6)}
+
+
+def parche(series, binarizar):
+    fig = Patch()
+    for k, y in enumerate(series):
+        fig["data"][k]["y"] = binarizar(y) if binarizar else y
+    return fig
+
+
+def historico_sintetico(dias=1200):
+    """Cumulative cases/deaths with the shape and magnitude of a large country's disease.sh history"""
+    fechas = np.datetime64("2020-01-22") + np.arange(dias)
+    rng = np.random.default_rng(0)
+    casos = np.cumsum(rng.poisson(20000 * (1 + np.sin(np.arange(dias) / 60) ** 2)))
+    return {"timeline": {
+        "cases": {f.item().strftime("%-m/%-d/%y"): int(c) for f, c in zip(fechas, casos)},
+        "deaths": {f.item().strftime("%-m/%-d/%y"): int(c) // 90 for f, c in zip(fechas, casos)}
+    }}
+
+
+def casos():
+    import app  # noqa: F401  registers the pages
+    from pages import clase4, clase6, clase7
+    from utils import binario
+
+    sir = clase4.simular_sir(1000, 0.4, 0.1, 10)[:3]
+    seir = clase6.simular_seir(1000, 0.4, 0.33, 0.1, 10, 0)[:4]
+    barrido = clase4.figura_barrido(clase4.calcular_barrido(200, 1000, 10))
+
+    hist = historico_sintetico()
+    clase7.get_country_current = lambda pais, timeout=10: {"cases": 1}
+    clase7.get_country_hist = lambda pais, dias, timeout=10: hist
+
+    # figura_base() caches whatever binarizar() returned on its first call
+    binario.ACTIVO = False
+    base_antes = {p: p.figura_base() for p in (clase4, clase6)}
+    covid_antes = clase7.actualizar(None, "USA", "all", None)[4]
+    binario.ACTIVO = True
+    for p in base_antes:
+        p.figura_base.cache_clear()
+    base_despues = {p: p.figura_base() for p in (clase4, clase6)}
+    covid_despues = clase7.actualizar(None, "USA", "all", None)[4]
+
+    return [
+        ("clase4", "figura", lambda: base_antes[clase4], lambda: base_despues[clase4]),
+        ("clase4", "parche", lambda: parche(sir, None), lambda: parche(sir, binario.arreglo)),
+        ("clase4", "barrido 200x200", lambda: barrido, lambda: binario.binarizar(barrido)),
+        ("clase6", "figura", lambda: base_antes[clase6], lambda: base_despues[clase6]),
+        ("clase6", "parche", lambda: parche(seir, None), lambda: parche(seir, binario.arreglo)),
+        ("clase7", "figura Todo", lambda: covid_antes, lambda: covid_despues),
+    ]
+
+
+def comparar(repeticiones):
+    resultados = []
+    for pagina, caso, antes, despues in casos():
+        a, d = medir(antes, repeticiones), medir(despues, repeticiones)
+        resultados.append({"pagina": pagina, "caso": caso, "actual": a, "binario": d,
+                           "reduccion_bytes": round(1 - d["bytes"] / a["bytes"], 3)})
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara la serialización JSON actual con la de arreglos binarios")
+    parser.add_argument("-n", "--repeticiones", type=int, default=20, help="repeticiones por caso (mediana)")
+    parser.add_argument("-o", "--output", help="archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args(argv)
+
+    reporte = json.dumps(comparar(args.repeticiones), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(reporte + "\n")
+    else:
+        print(reporte)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,85 @@
 import dash
 from dash import dcc, html
-import plotly.graph_objects as go
 import numpy as np
+from utils.cache_figuras import figura_cacheada
 
 dash.register_page(__name__)
 
+def construir_figura():
+    return {
+        'data': [{
+            'x': list(np.linspace(0, 100, 10)),  
+            'y': list(100 * np.exp(0.03 * np.linspace(0, 100, 10))),  
+            'line': {
+                'dash': 'solid',
+                'color': 'var(--uv-bio)',
+                'width': 2
+            },
+            'marker': {
+                'color': 'var(--uv-mate)',
+                'symbol': 'circle',
+                'size': 8
+            },
+            'name': 'P(t) = P₀eʳᵗ',
+            'hovertemplate': 't: %{x:.2f}<br>P(t): %{y:.2f}<extra></extra>'
+        }],
+        'layout': {
+            'title': {
+                'text': '<b>Crecimiento de la población</b>',
+                'font': {
+                    'size': 20,
+                    'color': 'var(--uv-navbar)'
+                },
+                'x': 0.5,
+                'y': 0.93
+            },
+            'xaxis': {
+                'title': 'Tiempo (t)',
+                'showgrid': True,
+                'gridcolor': 'var(--uv-sombra)',
+                'zeroline': True,
+                'zerolinecolor': 'var(--uv-texto2)',
+                'showline': True,
+                'linecolor': 'var(--uv-texto2)',
+                'linewidth': 1,
+                'mirror': True,
+                'title_font': {'size': 14, 'color': 'var(--uv-texto)'},
+                'tickfont': {'size': 12, 'color': 'var(--uv-texto2)'}
+            },
+            'yaxis': {
+                'title': 'Población P(t)',
+                'showgrid': True,
+                'gridcolor': 'var(--uv-sombra)',
+                'zeroline': True,
+                'zerolinecolor': 'var(--uv-texto2)',
+                'showline': True,
+                'linecolor': 'var(--uv-texto2)',
+                'linewidth': 1,
+                'mirror': True,
+                'title_font': {'size': 14, 'color': 'var(--uv-texto)'},
+                'tickfont': {'size': 12, 'color': 'var(--uv-texto2)'}
+            },
+            'margin': {'l': 60, 'r': 30, 't': 60, 'b': 60},
+            'paper_bgcolor': 'rgba(0,0,0,0)',
+            'plot_bgcolor': 'var(--uv-blanco)',
+            'font': {
+                'family': 'Segoe UI, Arial, sans-serif',
+                'size': 13,
+                'color': 'var(--uv-texto)'
+            },
+            'legend': {
+                'font': {'size': 12, 'color': 'var(--uv-texto2)'},
+                'bgcolor': 'rgba(0,0,0,0)',
+                'bordercolor': 'var(--uv-sombra)',
+                'borderwidth': 1,
+                'x': 0.02,
+                'y': 0.98,
+                'yanchor': 'top',
+                'xanchor': 'left'
+            }
+        }
+    }
+
 layout = html.Div(style={
     'display': 'flex',
     'height': 'calc(100vh - 60px)',
@@ -61,79 +136,7 @@ layout = html.Div(style={
         html.Div(style={'width': '100%', 'height': '100%'}, children=[
             dcc.Graph(
                 id='population-growth-graph',
-                figure={
-                    'data': [{
-                        'x': list(np.linspace(0, 100, 10)),  
-                        'y': list(100 * np.exp(0.03 * np.linspace(0, 100, 10))),  
-                        'line': {
-                            'dash': 'solid',
-                            'color': 'var(--uv-bio)',
-                            'width': 2
-                        },
-                        'marker': {
-                            'color': 'var(--uv-mate)',
-                            'symbol': 'circle',
-                            'size': 8
-                        },
-                        'name': 'P(t) = P₀eʳᵗ',
-                        'hovertemplate': 't: %{x:.2f}<br>P(t): %{y:.2f}<extra></extra>'
-                    }],
-                    'layout': {
-                        'title': {
-                            'text': '<b>Crecimiento de la población</b>',
-                            'font': {
-                                'size': 20,
-                                'color': 'var(--uv-navbar)'
-                            },
-                            'x': 0.5,
-                            'y': 0.93
-                        },
-                        'xaxis': {
-                            'title': 'Tiempo (t)',
-                            'showgrid': True,
-                            'gridcolor': 'var(--uv-sombra)',
-                            'zeroline': True,
-                            'zerolinecolor': 'var(--uv-texto2)',
-                            'showline': True,
-                            'linecolor': 'var(--uv-texto2)',
-                            'linewidth': 1,
-                            'mirror': True,
-                            'title_font': {'size': 14, 'color': 'var(--uv-texto)'},
-                            'tickfont': {'size': 12, 'color': 'var(--uv-texto2)'}
-                        },
-                        'yaxis': {
-                            'title': 'Población P(t)',
-                            'showgrid': True,
-                            'gridcolor': 'var(--uv-sombra)',
-                            'zeroline': True,
-                            'zerolinecolor': 'var(--uv-texto2)',
-                            'showline': True,
-                            'linecolor': 'var(--uv-texto2)',
-                            'linewidth': 1,
-                            'mirror': True,
-                            'title_font': {'size': 14, 'color': 'var(--uv-texto)'},
-                            'tickfont': {'size': 12, 'color': 'var(--uv-texto2)'}
-                        },
-                        'margin': {'l': 60, 'r': 30, 't': 60, 'b': 60},
-                        'paper_bgcolor': 'rgba(0,0,0,0)',
-                        'plot_bgcolor': 'var(--uv-blanco)',
-                        'font': {
-                            'family': 'Segoe UI, Arial, sans-serif',
-                            'size': 13,
-                            'color': 'var(--uv-texto)'
-                        },
-                        'legend': {
-                            'font': {'size': 12, 'color': 'var(--uv-texto2)'},
-                            'bgcolor': 'rgba(0,0,0,0)',
-                            'bordercolor': 'var(--uv-sombra)',
-                            'borderwidth': 1,
-                            'x': 0.02,
-                            'y': 0.98,
-                            'yanchor': 'top',
-                            'xanchor': 'left'
-                        }
-                    }
-                },
+                figure=figura_cacheada("clase1", [__file__], construir_figura),
                 style={
                     'height': '100%',
                     'width': '100%',
@@ -1,7 +1,10 @@
 import dash
-from dash import dcc, html
+from dash import dcc, html, Input, Output, callback
 import plotly.graph_objects as go
 import numpy as np
+from utils import campos
+from utils.cache_figuras import figura_cacheada
+from utils.campos import campo_direcciones
 
 dash.register_page(__name__, name="Clase 2: E. Logística", path="/clase2")
 
@@ -12,61 +15,67 @@ t = np.linspace(0, 60, 400)
 
 
 P0_vals = [10, 30, 50, 120, 140]
+N_MALLA = 15
 colors  = ["var(--uv-bio)", "var(--uv-mate)", "var(--uv-graf)", "#b35a00", "#6f42c1"]
 
-fig = go.Figure()
-for p0, c in zip(P0_vals, colors):
-    P = K * p0 / (p0 + (K - p0) * np.exp(-r * t))
-    fig.add_trace(go.Scatter(
-        x=t, y=P, mode='lines', name=f"P₀ = {p0}",
-        line=dict(color=c, width=2.5),
+def curvas_logisticas(r, K, P0_vals, t):
+    P0 = np.asarray(P0_vals, dtype=float)[:, None]
+    return K * P0 / (P0 + (K - P0) * np.exp(-r * t[None, :]))
+
+def trazas(r, K, P0_vals, n):
+    curvas = curvas_logisticas(r, K, P0_vals, t)
+    data = [dict(
+        type="scatter", x=t, y=P, mode="lines", name=f"P₀ = {p0:g}",
+        line=dict(color=colors[i % len(colors)], width=2.5),
+        showlegend=len(P0_vals) <= 10,
         hovertemplate="t = %{x:.1f}<br>P = %{y:.1f}<extra></extra>"
-    ))
-
-Tgrid = np.linspace(2, 60, 15)       
-Pgrid = np.linspace(5, 145, 12)      
-T, P  = np.meshgrid(Tgrid, Pgrid)
-dPdt  = r * P * (1 - P / K)          
-
-for i in range(len(Tgrid)):
-    for j in range(len(Pgrid)):
-        dt = 2.0
-        dp = dPdt[j,i] * 0.5
-        
-        fig.add_annotation(
-            x=T[j,i] + dt/2,
-            y=P[j,i] + dp/2,
-            ax=T[j,i] - dt/2,
-            ay=P[j,i] - dp/2,
-            xref="x",
-            yref="y",
-            axref="x",
-            ayref="y",
-            showarrow=True,
-            arrowhead=2,
-            arrowsize=1,
-            arrowwidth=1.5,
-            arrowcolor='rgba(0, 82, 147, 0.7)'
-        )
-
-fig.add_hline(y=K, line_dash="dash", line_color="var(--uv-navbar)",
-              annotation_text="Capacidad de carga K", annotation_position="right")
-
-fig.update_layout(
-    title={
-        "text": "<b>Campo de vectores – Ecuación logística</b>",
-        "x": 0.5,
-        "font": {"size": 20, "color": "var(--uv-navbar)"}
-    },
-    xaxis_title="Tiempo (t)",
-    yaxis_title="Población P(t)",
-    template="simple_white",
-    paper_bgcolor="var(--uv-blanco)",
-    plot_bgcolor="var(--uv-blanco)",
-    font={"family": "Segoe UI", "size": 13, "color": "var(--uv-texto)"},
-    margin={"l": 60, "r": 30, "t": 60, "b": 60},
-    legend={"x": 0.02, "y": 0.98}
-)
+    ) for i, (p0, P) in enumerate(zip(P0_vals, curvas))]
+
+    ptop  = 1.04 * max(K, max(P0_vals))
+    Tgrid = np.linspace(2, 60, n)
+    Pgrid = np.linspace(0.035 * ptop, ptop, max(2, round(n * 0.8)))
+    T, P  = np.meshgrid(Tgrid, Pgrid)
+    dPdt  = r * P * (1 - P / K)
+    dt    = 0.5 * (Tgrid[1] - Tgrid[0])
+
+    data.append(campo_direcciones(T, P, dt, dPdt * dt / 4))
+    return data
+
+def construir_figura():
+    fig = go.Figure(trazas(r, K, P0_vals, N_MALLA))
+
+    fig.add_hline(y=K, line_dash="dash", line_color="var(--uv-navbar)",
+                  annotation_text="Capacidad de carga K", annotation_position="right")
+
+    fig.update_layout(
+        title={
+            "text": "<b>Campo de vectores – Ecuación logística</b>",
+            "x": 0.5,
+            "font": {"size": 20, "color": "var(--uv-navbar)"}
+        },
+        xaxis_title="Tiempo (t)",
+        yaxis_title="Población P(t)",
+        template="simple_white",
+        paper_bgcolor="var(--uv-blanco)",
+        plot_bgcolor="var(--uv-blanco)",
+        font={"family": "Segoe UI", "size": 13, "color": "var(--uv-texto)"},
+        margin={"l": 60, "r": 30, "t": 60, "b": 60},
+        legend={"x": 0.02, "y": 0.98}
+    )
+    return fig
+
+def leer_P0(texto):
+    vals = []
+    for parte in (texto or "").replace(";", ",").split(","):
+        try:
+            v = float(parte)
+        except ValueError:
+            continue
+        if np.isfinite(v) and v > 0:
+            vals.append(v)
+    return vals[:100] or P0_vals
+
+fig = figura_cacheada("clase2", [__file__, campos.__file__], construir_figura)
 
 layout = html.Div(className="page-container", children=[
     html.Div(className="fila-50-50", children=[
@@ -86,8 +95,48 @@ modela el crecimiento de una población con recursos limitados.
 - **Decrecimiento**: si $P>K$ los vectores apuntan hacia abajo, forzando el retorno a $K$.
 
 El gráfico interactivo muestra varias soluciones (líneas de color) sobre el campo de vectores (segmentos grises).
-""", mathjax=True)
+""", mathjax=True),
+
+            html.Div(className="card-viva mt-3", children=[
+                html.Label("Tasa de crecimiento  r", className="label-viva"),
+                dcc.Slider(id="log-r", min=0.01, max=0.3, step=0.01, value=r,
+                           marks={0.01: "0.01", 0.15: "0.15", 0.3: "0.3"},
+                           tooltip={"placement": "bottom", "always_visible": True}),
+
+                html.Label("Capacidad de carga  K", className="label-viva"),
+                dcc.Slider(id="log-K", min=20, max=300, step=10, value=K,
+                           marks={20: "20", 100: "100", 200: "200", 300: "300"},
+                           tooltip={"placement": "bottom", "always_visible": True}),
+
+                html.Label("Poblaciones iniciales  P₀ (separadas por comas)", className="label-viva"),
+                dcc.Input(id="log-P0", type="text", value=", ".join(str(p) for p in P0_vals),
+                          debounce=True, className="input-viva"),
+
+                html.Label("Densidad del campo (flechas por eje)", className="label-viva"),
+                dcc.Slider(id="log-n", min=5, max=100, step=5, value=N_MALLA,
+                           marks={5: "5", 50: "50", 100: "100"},
+                           tooltip={"placement": "bottom", "always_visible": True})
+            ])
         ]),
-        html.Div(className="col-50", children=dcc.Graph(figure=fig, style={"height": "80vh"}))
+        html.Div(className="col-50", children=dcc.Graph(id="grafica-logistica", figure=fig, style={"height": "80vh"}))
     ])
-])
\ No newline at end of file
+])
+
+@callback(
+    Output("grafica-logistica", "figure"),
+    Input("log-r", "value"),
+    Input("log-K", "value"),
+    Input("log-P0", "value"),
+    Input("log-n", "value"),
+    prevent_initial_call=True
+)
+def actualizar_campo(r, K, p0_texto, n):
+    r = r or 0.08
+    K = K or 100
+    n = int(n or N_MALLA)
+
+    base = fig["layout"]
+    layout = dict(base,
+                  shapes=[dict(base["shapes"][0], y0=K, y1=K)],
+                  annotations=[dict(base["annotations"][0], y=K)])
+    return {"data": trazas(r, K, leer_P0(p0_texto), n), "layout": layout}
@@ -1,13 +1,18 @@
 import dash
-from dash import html, dcc, Input, Output, callback
+from dash import html, dcc, Input, Output, State, Patch, callback, clientside_callback, no_update
 import plotly.graph_objects as go
 import numpy as np
+import os
+from utils.memo import memoizar
+from utils import muestreo
 
 dash.register_page(__name__,
                    path="/clase3",
                    name="Clase 3: Crecimiento Poblacional",
                    title="Población – DASH-TM")
 
+MODO = os.environ.get("DASH_TM_CLASE3_MODO", "cliente")
+
 def solve_exp(r, P0, t):
     return P0 * np.exp(r * t)
 
@@ -17,6 +22,40 @@ def solve_log(r, K, P0, t):
 colores = {"exp": {"bg": "#d4f5e0", "line": "#00a085", "accent": "#00b894"},
            "log": {"bg": "#ffe2c2", "line": "#d35400", "accent": "#e17055"}}
 
+ECUACIONES = {
+    "exp": r"""
+        **Ecuación exponencial**  
+        $\displaystyle P(t)=P_0\,e^{rt}$  
+        Sin límite: la población crece **sin freno**.
+        """,
+    "log": r"""
+        **Ecuación logística**  
+        $\displaystyle \frac{dP}{dt}=rP\left(1-\frac{P}{K}\right)$  
+        *K* = capacidad de carga; cuando $P\to K$ el crecimiento se frena.
+        """
+}
+
+def estilo_figura(fig, c):
+    fig.update_layout(
+        xaxis_title="Tiempo (días)",
+        yaxis_title="Población",
+        template="simple_white",
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor=c["bg"],
+        font=dict(family="Segoe UI", size=13, color="#2d3436"),
+        margin=dict(l=60, r=30, t=60, b=60),
+        legend=dict(x=0.02, y=0.98)
+    )
+    return fig
+
+def figura_base(c):
+    fig = go.Figure()
+    fig.add_scatter(x=[], y=[], mode="lines", name="P(t)",
+                    line=dict(color=c["line"], width=3.5))
+    return estilo_figura(fig, c)
+
+FIGURA_BASE = figura_base(colores["exp"])
+
 layout = html.Div(className="page-container", children=[
 
     html.Div(className="fila-50-50", children=[
@@ -58,56 +97,103 @@ layout = html.Div(className="page-container", children=[
         ]),
 
         html.Div(className="col-50", children=[
-            dcc.Graph(id="grafica", style={"height":"65vh"})
+            dcc.Graph(id="grafica", figure=FIGURA_BASE, style={"height":"65vh"}),
+            dcc.Store(id="clase3-base", data={
+                "layout": FIGURA_BASE.to_dict()["layout"],
+                "colores": colores,
+                "ecuaciones": ECUACIONES,
+                "puntos_por_pixel": muestreo.PUNTOS_POR_PIXEL
+            }) if MODO == "cliente" else dcc.Store(id="grafica-ancho")
         ])
     ])
 ])
 
-@callback(
-    Output("grafica","figure"),
-    Output("texto-info","children"),
-    Output("control-card","style"),
-    Input("modelo","value"),
-    Input("r","value"),
-    Input("K","value"),
-    Input("P0","value"),
-    Input("dias","value")
-)
-def update_page(modelo, r, K, P0, dias):
+def evaluar(modelo, r, K, P0, t):
     if P0 is None or P0 <= 0: P0 = 1
+    return solve_exp(r, P0, t) if modelo == "exp" else solve_log(r, K, P0, t)
+
+@memoizar("clase3")
+def calcular_crecimiento(modelo, r, K, P0, dias):
     t = np.linspace(0, dias, dias*10 + 1)
-    c = colores[modelo]
+    y = evaluar(modelo, r, K, P0, t)
 
     if modelo == "exp":
-        y = solve_exp(r, P0, t)
         tit = f"Exponencial  (r = {r:.3f})"
-        eq = r"""
-        **Ecuación exponencial**  
-        $\displaystyle P(t)=P_0\,e^{rt}$  
-        Sin límite: la población crece **sin freno**.
-        """
     else:
-        y = solve_log(r, K, P0, t)
         tit = f"Logístico  (r = {r:.3f},  K = {K:.0f})"
-        eq = r"""
-        **Ecuación logística**  
-        $\displaystyle \frac{dP}{dt}=rP\left(1-\frac{P}{K}\right)$  
-        *K* = capacidad de carga; cuando $P\to K$ el crecimiento se frena.
-        """
+    return t, y, tit
 
-    fig = go.Figure()
-    fig.add_scatter(x=t, y=y, mode="lines", name="P(t)",
-                    line=dict(color=c["line"], width=3.5))
+def update_page(modelo, r, K, P0, dias, ancho=None):
+    t, y, tit = calcular_crecimiento(modelo, r, K, P0, dias)
+    t, (y,) = muestreo.reducir(t, [y], ancho)
+    c = colores[modelo]
 
-    fig.update_layout(
-        title=tit,
-        xaxis_title="Tiempo (días)",
-        yaxis_title="Población",
-        template="simple_white",
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor=c["bg"],
-        font=dict(family="Segoe UI", size=13, color="#2d3436"),
-        margin=dict(l=60, r=30, t=60, b=60),
-        legend=dict(x=0.02, y=0.98)
+    fig = Patch()
+    fig["data"][0]["x"] = t
+    fig["data"][0]["y"] = y
+    fig["data"][0]["line"]["color"] = c["line"]
+    fig["layout"]["title"] = {"text": tit}
+    fig["layout"]["plot_bgcolor"] = c["bg"]
+    return fig, ECUACIONES[modelo], {"background":c["bg"]}
+
+salidas = [Output("grafica","figure"), Output("texto-info","children"), Output("control-card","style")]
+entradas = [Input("modelo","value"), Input("r","value"), Input("K","value"),
+            Input("P0","value"), Input("dias","value")]
+
+if MODO == "cliente":
+    clientside_callback(
+        """
+        function(modelo, r, K, P0, dias, base) {
+            if (P0 === null || P0 === undefined || P0 <= 0) P0 = 1;
+            // Same point budget as the server path: never more points than the graph can show
+            const el = document.getElementById("grafica");
+            const n = Math.min(dias * 10 + 1, el && el.offsetWidth ? el.offsetWidth * base.puntos_por_pixel : Infinity);
+            const t = new Array(n), y = new Array(n);
+            for (let i = 0; i < n; i++) {
+                t[i] = dias * i / (n - 1);
+                y[i] = modelo === "exp"
+                    ? P0 * Math.exp(r * t[i])
+                    : K * P0 / (P0 + (K - P0) * Math.exp(-r * t[i]));
+            }
+            const c = base.colores[modelo];
+            const tit = modelo === "exp"
+                ? `Exponencial  (r = ${r.toFixed(3)})`
+                : `Logístico  (r = ${r.toFixed(3)},  K = ${K.toFixed(0)})`;
+            const figura = {
+                data: [{type: "scatter", x: t, y: y, mode: "lines", name: "P(t)",
+                        line: {color: c.line, width: 3.5}}],
+                layout: Object.assign({}, base.layout, {title: {text: tit}, plot_bgcolor: c.bg})
+            };
+            return [figura, base.ecuaciones[modelo], {background: c.bg}];
+        }
+        """,
+        *salidas, *entradas, State("clase3-base", "data")
+    )
+else:
+    callback(*salidas, *entradas, State("grafica-ancho", "data"))(update_page)
+    muestreo.registrar_ancho("grafica", "grafica-ancho")
+
+    @callback(
+        Output("grafica", "figure", allow_duplicate=True),
+        Input("grafica", "relayoutData"),
+        *[State(e.component_id, e.component_property) for e in entradas],
+        State("grafica-ancho", "data"),
+        prevent_initial_call=True
     )
-    return fig, eq, {"background":c["bg"]}
\ No newline at end of file
+    def zoom_page(relayout, modelo, r, K, P0, dias, ancho):
+        ventana = muestreo.ventana_x(relayout)
+        if ventana is None:
+            return no_update
+        if ventana == "auto":
+            t, y, _ = calcular_crecimiento(modelo, r, K, P0, dias)
+            t, (y,) = muestreo.reducir(t, [y], ancho)
+        else:
+            # Resample the visible window alone at the full point budget of the graph
+            x0, x1 = max(float(ventana[0]), 0), min(float(ventana[1]), dias)
+            t = np.linspace(x0, x1, muestreo.max_puntos(ancho))
+            y = evaluar(modelo, r, K, P0, t)
+
+        fig = Patch()
+        fig["data"][0]["x"] = t
+        fig["data"][0]["y"] = y
+        return fig
@@ -1,7 +1,11 @@
 import dash
-from dash import dcc, html, Input, Output, State, callback
+from dash import dcc, html, Input, Output, State, Patch, callback
 import plotly.graph_objects as go
 import numpy as np
+from utils.campos import quiver
+from utils.expresiones import ErrorExpresion, compilar
+from utils.trayectorias import lineas_de_flujo
+from utils import binario, trabajos
 
 dash.register_page(__name__,
                    path="/clase5",
@@ -9,15 +13,17 @@ dash.register_page(__name__,
                    title="Campo Vectorial – DASH-TM",
                    description="Dibuja cualquier campo vectorial 2D interactivamente.")
 
-def safe_eval(expr, X, Y):
+def evaluar_campo(nombre, expr, X, Y):
     try:
-        d = {"X": X, "Y": Y, "np": np,
-             "sin": np.sin, "cos": np.cos, "tan": np.tan,
-             "exp": np.exp, "sqrt": np.sqrt,
-             "pi": np.pi, "e": np.e}
-        return eval(expr, d)
-    except Exception:
-        return np.full_like(X, np.nan)
+        return compilar(expr)(X, Y)
+    except ErrorExpresion as e:
+        raise ValueError(f"{nombre}: {e}") from e
+
+def trayectorias_fase(fx_str, fy_str, xmax, ymax, semillas, progreso=None):
+    """Background job: streamlines of the phase portrait as NaN-separated arrays"""
+    f_x, f_y = compilar(fx_str), compilar(fy_str)
+    return lineas_de_flujo(lambda x, y: (f_x(x, y), f_y(x, y)),
+                           (-xmax, xmax, -ymax, ymax), semillas=semillas, progreso=progreso)
 
 layout = html.Div(className="page-container", children=[
 
@@ -43,7 +49,17 @@ layout = html.Div(className="page-container", children=[
             dcc.Input(id="input-ymax", type="number", value=5, min=1, className="input-viva"),
 
             html.Label("Puntos de malla", className="label-viva"),
-            dcc.Input(id="input-n", type="number", value=15, min=5, max=30, className="input-viva"),
+            dcc.Input(id="input-n", type="number", value=15, min=5, max=200, className="input-viva"),
+
+            html.Label("Modo", className="label-viva"),
+            dcc.RadioItems(id="modo-campo",
+                options=[{"label": " Flechas", "value": "flechas"},
+                         {"label": " Retrato de fase", "value": "fase"}],
+                value="flechas", className="radio-group"),
+
+            html.Label("Trayectorias (retrato de fase)", className="label-viva"),
+            dcc.Input(id="input-semillas", type="number", value=400, min=10, max=2000, step=10,
+                      className="input-viva"),
 
             html.Button("Generar campo", id="btn-generar", className="btn btn-primary btn-block"),
 
@@ -58,7 +74,8 @@ layout = html.Div(className="page-container", children=[
         ]),
 
         html.Div(className="col-60", children=[
-            dcc.Graph(id="grafica-campo", className="graph-viva", config={'displayModeBar': False})
+            dcc.Graph(id="grafica-campo", className="graph-viva", config={'displayModeBar': False}),
+            *trabajos.componentes("fase", 300, "context-viva"),
         ])
     ])
 ])
@@ -66,18 +83,23 @@ layout = html.Div(className="page-container", children=[
 @callback(
     Output("grafica-campo", "figure"),
     Output("info-campo", "children"),
+    Output("fase-trabajo", "data"),
+    Output("fase-intervalo", "disabled"),
     Input("btn-generar", "n_clicks"),
     Input("btn-xy", "n_clicks"),
     Input("btn-rot", "n_clicks"),
     Input("btn-mix", "n_clicks"),
+    Input("modo-campo", "value"),
     State("input-fx", "value"),
     State("input-fy", "value"),
     State("input-xmax", "value"),
     State("input-ymax", "value"),
     State("input-n", "value"),
+    State("input-semillas", "value"),
+    State("fase-trabajo", "data"),
     prevent_initial_call=True
 )
-def actualizar(_, __, ___, ____, fx_orig, fy_orig, xmax, ymax, n):
+def actualizar(_, __, ___, ____, modo, fx_orig, fy_orig, xmax, ymax, n, semillas, anterior):
     try:
         ctx = dash.callback_context
         if not ctx.triggered:
@@ -97,43 +119,25 @@ def actualizar(_, __, ___, ____, fx_orig, fy_orig, xmax, ymax, n):
         y = np.linspace(-ymax, ymax, n)
         X, Y = np.meshgrid(x, y)
 
-        fx = safe_eval(fx_str, X, Y)
-        fy = safe_eval(fy_str, X, Y)
-
-        if np.isnan(fx).any() or np.isnan(fy).any():
-            raise ValueError("Revisa la sintaxis de las funciones.")
+        fx = evaluar_campo("dx/dt", fx_str, X, Y)
+        fy = evaluar_campo("dy/dt", fy_str, X, Y)
 
         mag = np.hypot(fx, fy)
-        mag_min, mag_max = mag.min(), mag.max()
-
-        fig = go.Figure()
-
-        fig.add_trace(go.Scatter(
-            x=[None], y=[None],
-            mode="markers",
-            marker=dict(colorscale="Viridis", cmin=mag_min, cmax=mag_max,
-                        colorbar=dict(title="Magnitud"), showscale=True),
-            showlegend=False
-        ))
-
-        for i in range(n):
-            for j in range(n):
-                x0, y0 = X[i, j], Y[i, j]
-                u, v = fx[i, j], fy[i, j]
-                if np.isnan(u) or np.isnan(v) or (u == 0 and v == 0):
-                    continue
-                
-                color_int = int(255 * (mag[i, j] - mag_min) / (mag_max - mag_min + 1e-12))
-                rgb = f"rgb({int(255 - color_int)}, {int(color_int)}, {int(255 - color_int * 0.5)})"
-
-                fig.add_trace(go.Scatter(
-                    x=[x0, x0 + u], y=[y0, y0 + v],
-                    mode="lines+markers",
-                    line=dict(width=2.5, color=rgb),
-                    marker=dict(size=4, color=rgb),
-                    hovertemplate=f"Punto: ({x0:.1f}, {y0:.1f})<br>Vector: ({u:.2f}, {v:.2f})<extra></extra>",
-                    showlegend=False
-                ))
+        if not np.isfinite(mag).any():
+            raise ValueError("El campo no tiene valores finitos en este rango.")
+        mag_min, mag_max = np.nanmin(mag), np.nanmax(mag)
+        paso = 2 * min(xmax, ymax) / (n - 1)
+
+        fig = go.Figure(quiver(X, Y, fx, fy, 0.9 * paso))
+        info = f"Magnitud vectorial: min = {mag_min:.2f}, max = {mag_max:.2f}"
+
+        # Streamlines are integrated as a background job and appended when ready
+        trabajo = None
+        if modo == "fase":
+            trabajo = trabajos.lanzar(trayectorias_fase, fx_str, fy_str, xmax, ymax, semillas or 400,
+                                      reemplaza=anterior)
+        else:
+            trabajos.cancelar(anterior)
 
         fig.update_layout(
             title=dict(text=f"dx/dt = {fx_str} | dy/dt = {fy_str}", x=0.5),
@@ -145,10 +149,21 @@ def actualizar(_, __, ___, ____, fx_orig, fy_orig, xmax, ymax, n):
             plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)"
         )
 
-        return fig, f"Magnitud vectorial: min = {mag_min:.2f}, max = {mag_max:.2f}"
+        return fig, info, trabajo, trabajo is None
 
     except Exception as e:
         fig = go.Figure().add_annotation(
             text=f"Error: {e}", showarrow=False, font_size=14
         )
-        return fig, f"Error: {e}"
\ No newline at end of file
+        return fig, f"Error: {e}", None, True
+
+def fase_lista(res):
+    """Append the streamlines to the quiver already on screen"""
+    lx, ly = res
+    fig = Patch()
+    fig["data"].append(go.Scatter(x=binario.arreglo(lx), y=binario.arreglo(ly), mode="lines",
+                                  hoverinfo="skip", showlegend=False,
+                                  line=dict(width=1, color="rgba(0, 43, 69, 0.45)")).to_plotly_json())
+    return fig, f"{np.isnan(lx).sum()} trayectorias"
+
+trabajos.registrar_sondeo("fase", Output("grafica-campo", "figure", allow_duplicate=True), fase_lista)
@@ -1,8 +1,13 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, Input, Output, State, Patch, no_update
 import plotly.graph_objects as go
-import requests
-from datetime import datetime
+from plotly.subplots import make_subplots
+import numpy as np
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from utils import ajuste, binario, covid_analisis, covid_store, muestreo, trabajos
+from utils.covid_api import cliente
+from utils import referencia
 
 dash.register_page(__name__, path="/clase7", name="Clase 7: Covid-19 Global")
 
@@ -10,35 +15,61 @@ def fmt(n):
     return f"{int(n or 0):,}"
 
 def get_countries_list():
+    return sorted([c["country"] for c in cliente.paises()])
 
-    try:
-        r = requests.get("https://disease.sh/v3/covid-19/countries", timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        return sorted([c["country"] for c in data])
-    except Exception as e:
-        print("Error obteniendo países:", e)
-        return ["Peru", "Mexico", "USA", "Canada"]
+referencia.registrar("paises", get_countries_list, intervalo=24 * 3600)
+
+PLAZO = float(os.environ.get("DASH_TM_COVID_PLAZO", 8))
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="covid")
 
-def get_country_current(country):
+def get_country_current(country, timeout=10):
     try:
-        url = f"https://disease.sh/v3/covid-19/countries/{country}"
-        return requests.get(url, timeout=10).json()
+        return cliente.actual(country, timeout=timeout)
     except Exception as e:
         print("Error obteniendo datos actuales:", e)
         return None
 
-def get_country_hist(country, days):
+def get_country_hist(country, days, timeout=10):
     try:
-        url = f"https://disease.sh/v3/covid-19/historical/{country}"
-        params = {"lastdays": days}
-        r = requests.get(url, params=params, timeout=10)
-        r.raise_for_status()
-        return r.json()
+        return cliente.historico(country, days, timeout=timeout)
     except Exception as e:
         print("Error obteniendo histórico:", e)
         return None
 
+def obtener_datos(pais, dias, plazo=PLAZO):
+    """Current and historical data fetched concurrently; whatever fails or misses the deadline comes back as None"""
+    futuros = [_pool.submit(get_country_current, pais, plazo),
+               _pool.submit(cargar_historico, pais, dias, plazo)]
+    wait(futuros, timeout=plazo)
+    resultados = []
+    for f in futuros:
+        if not f.done():
+            resultados.append(None)
+        elif f.exception() is not None:
+            print("Error obteniendo datos de", pais, "-", f.exception())
+            resultados.append(None)
+        else:
+            resultados.append(f.result())
+    return resultados
+
+def serie_historica(hist):
+    fechas, campos = covid_analisis.serie(hist["timeline"])
+    if "cases" not in campos or "deaths" not in campos:
+        print("Histórico incompleto para", hist.get("country"))
+        return None
+    return fechas, campos["cases"], campos["deaths"]
+
+def cargar_historico(pais, dias, timeout=10):
+    """(fechas, casos, muertes) from the local store, or from disease.sh when the country is not stored"""
+    local = covid_store.historico(pais, dias)
+    if local is not None:
+        fechas, campos = local
+        return fechas, campos["cases"], campos["deaths"]
+    hist = get_country_hist(pais, dias, timeout)
+    if not hist or "timeline" not in hist:
+        return None
+    return serie_historica(hist)
+
 layout = html.Div(className="page-container", children=[
 
     html.H2("Covid-19 por País", className="titulo-viva center"),
@@ -50,7 +81,7 @@ layout = html.Div(className="page-container", children=[
 
             html.Label("País", className="label-viva"),
             dcc.Dropdown(id="dd-pais",
-                         options=[{"label": c, "value": c} for c in get_countries_list()],
+                         options=[{"label": c, "value": c} for c in referencia.obtener("paises")],
                          value="Peru",
                          className="input-viva",
                          style={"width": "100%"}),
@@ -99,11 +130,31 @@ layout = html.Div(className="page-container", children=[
                 ])
             ]),
 
-            dcc.Graph(id="grafica-covid", style={"height": "60vh"})
+            dcc.Graph(id="grafica-covid", style={"height": "60vh"}),
+            dcc.Graph(id="grafica-indicadores", style={"height": "55vh"}),
+            dcc.Store(id="grafica-covid-ancho"),
+            dcc.Store(id="covid-consulta"),
+
+            html.Div(className="card-viva mt-3", children=[
+                html.H4("Ajuste de modelo a los datos", className="subt-viva"),
+                dcc.RadioItems(id="ajuste-modelo",
+                               options=[{"label": " SIR", "value": "sir"}, {"label": " SEIR", "value": "seir"}],
+                               value="sir", inline=True, className="radio-group"),
+                html.Button("Ajustar modelo", id="btn-ajustar", className="btn btn-primary"),
+                *trabajos.componentes("ajuste", 500, "context-viva"),
+                dcc.Graph(id="grafica-ajuste", style={"height": "50vh"}),
+            ])
         ])
     ])
 ])
 
+@callback(
+    Output("dd-pais", "options"),
+    Input("dd-pais", "id")
+)
+def cargar_paises(_):
+    return [{"label": c, "value": c} for c in referencia.obtener("paises")]
+
 @callback(
     Output("total-casos", "children"),
     Output("casos-hoy", "children"),
@@ -111,37 +162,44 @@ layout = html.Div(className="page-container", children=[
     Output("total-recuperados", "children"),
     Output("grafica-covid", "figure"),
     Output("info-msg", "children"),
+    Output("covid-consulta", "data"),
+    Output("grafica-indicadores", "figure"),
     Input("btn-actualizar", "n_clicks"),
     State("dd-pais", "value"),
     State("dd-dias", "value"),
+    State("grafica-covid-ancho", "data"),
     prevent_initial_call=False
 )
-def actualizar(_, pais, dias):
-    curr = get_country_current(pais)
-    if not curr:
+def actualizar(_, pais, dias, ancho):
+    curr, hist = obtener_datos(pais, dias)
+    if not curr and not hist:
         fig = go.Figure().add_annotation(text="Error al obtener datos", showarrow=False, font=dict(color="red"))
-        return ["Error"] * 4 + [fig, "No se pudieron cargar los datos."]
+        return ["Error"] * 4 + [fig, "No se pudieron cargar los datos.", None, go.Figure()]
 
-    total_c = fmt(curr.get("cases"))
-    hoy_c   = fmt(curr.get("todayCases"))
-    total_d = fmt(curr.get("deaths"))
-    recup   = fmt(curr.get("recovered"))
+    if curr:
+        total_c = fmt(curr.get("cases"))
+        hoy_c   = fmt(curr.get("todayCases"))
+        total_d = fmt(curr.get("deaths"))
+        recup   = fmt(curr.get("recovered"))
+    else:
+        total_c = hoy_c = total_d = recup = "—"
 
-    hist = get_country_hist(pais, dias)
-    if not hist or "timeline" not in hist:
+    if not hist:
         fig = go.Figure().add_annotation(text="Sin histórico", showarrow=False)
-        return [total_c, hoy_c, total_d, recup, fig, "Datos actuales cargados (sin histórico)."]
+        return [total_c, hoy_c, total_d, recup, fig, "Datos actuales cargados (sin histórico).", None, go.Figure()]
 
-    timeline = hist["timeline"]
-    cases   = timeline["cases"]
-    deaths  = timeline["deaths"]
-    fechas  = [datetime.strptime(f, "%m/%d/%y") for f in cases.keys()]
+    fechas, cases, deaths = hist
+    res = covid_analisis.analizar(pais, dias, fechas, cases)
+    series = ["nuevos", "media7", "media14", "rt", "duplicacion"]
+    fechas_ind, valores = muestreo.reducir(fechas, [res[k] for k in series], ancho)
+    indicadores = figura_indicadores(pais, fechas_ind, dict(zip(series, valores)))
+    fechas, (cases, deaths) = muestreo.reducir(fechas, [cases, deaths], ancho)
 
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
         x=fechas,
-        y=list(cases.values()),
+        y=cases,
         mode="lines",
         name="Casos",
         line=dict(color="#FF7F50", width=3),
@@ -152,7 +210,7 @@ def actualizar(_, pais, dias):
 
     fig.add_trace(go.Scatter(
         x=fechas,
-        y=list(deaths.values()),
+        y=deaths,
         mode="lines",
         name="Muertes",
         line=dict(color="#B22222", width=3),
@@ -184,6 +242,7 @@ def actualizar(_, pais, dias):
             font=dict(size=12)
         ),
         xaxis=dict(
+            type="date",
             showgrid=True,
             gridcolor="rgba(162, 169, 177, 0.2)",
             linewidth=1,
@@ -206,4 +265,121 @@ def actualizar(_, pais, dias):
         )
     )
 
-    return total_c, hoy_c, total_d, recup, fig, f"Datos actualizados para {pais}."
\ No newline at end of file
+    mensaje = f"Datos actualizados para {pais}." if curr else f"Histórico de {pais} cargado (sin datos actuales)."
+    return (total_c, hoy_c, total_d, recup, binario.binarizar(fig), mensaje, {"pais": pais, "dias": dias},
+            binario.binarizar(indicadores))
+
+def figura_indicadores(pais, fechas, res):
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.08, row_heights=[0.6, 0.4],
+                        subplot_titles=["Casos nuevos por día", "Número reproductivo efectivo Rt"])
+    fig.add_bar(x=fechas, y=res["nuevos"], name="Casos nuevos", marker_color="rgba(255, 127, 80, 0.35)",
+                hovertemplate="%{x|%d %b %Y}<br>%{y:,.0f} casos<extra></extra>", row=1, col=1)
+    fig.add_scatter(x=fechas, y=res["media7"], name="Media 7 días", mode="lines",
+                    line=dict(color="#d35400", width=2.5), row=1, col=1)
+    fig.add_scatter(x=fechas, y=res["media14"], name="Media 14 días", mode="lines",
+                    line=dict(color="#002b45", width=2, dash="dot"), row=1, col=1)
+    fig.add_scatter(x=fechas, y=res["rt"], name="Rt", mode="lines", line=dict(color="#6c5ce7", width=2.5),
+                    customdata=res["duplicacion"],
+                    hovertemplate="%{x|%d %b %Y}<br>Rt = %{y:.2f}<br>duplicación: %{customdata:.0f} días<extra></extra>",
+                    row=2, col=1)
+    fig.add_hline(y=1, line=dict(color="#B22222", dash="dash", width=1), row=2, col=1)
+
+    ultimo = res["duplicacion"][-1] if len(fechas) else np.nan
+    duplicacion = f"{ultimo:.0f} días" if np.isfinite(ultimo) else "sin crecimiento"
+    fig.update_layout(
+        title=dict(text=f"Indicadores derivados en <b>{pais}</b> · tiempo de duplicación actual: {duplicacion}",
+                   x=0.5, xanchor="center", font=dict(size=16, color="#002b45", family="Segoe UI")),
+        template="plotly_white",
+        font=dict(family="Segoe UI", size=13, color="#212529"),
+        margin=dict(l=60, r=30, t=80, b=50),
+        legend=dict(orientation="h", x=0.5, xanchor="center", y=-0.12),
+        hovermode="x unified",
+        bargap=0
+    )
+    fig.update_xaxes(type="date")
+    return fig
+
+muestreo.registrar_ancho("grafica-covid", "grafica-covid-ancho")
+
+@callback(
+    Output("grafica-covid", "figure", allow_duplicate=True),
+    Input("grafica-covid", "relayoutData"),
+    State("covid-consulta", "data"),
+    State("grafica-covid-ancho", "data"),
+    prevent_initial_call=True
+)
+def zoom_covid(relayout, consulta, ancho):
+    ventana = muestreo.ventana_x(relayout)
+    if ventana is None or not consulta:
+        return no_update
+    hist = cargar_historico(consulta["pais"], consulta["dias"])
+    if not hist:
+        return no_update
+
+    # Cut the full-resolution series to the visible dates before downsampling
+    fechas, cases, deaths = hist
+    if ventana != "auto":
+        x0, x1 = (np.datetime64(str(v).replace(" ", "T"), "D") for v in ventana)
+        dentro = (fechas >= x0 - 1) & (fechas <= x1 + 1)
+        fechas, cases, deaths = fechas[dentro], cases[dentro], deaths[dentro]
+    fechas, (cases, deaths) = muestreo.reducir(fechas, [cases, deaths], ancho)
+
+    fig = Patch()
+    for k, y in enumerate([cases, deaths]):
+        fig["data"][k]["x"] = binario.arreglo(fechas)
+        fig["data"][k]["y"] = binario.arreglo(y)
+    return fig
+
+def ajustar_modelo(modelo, pais, dias, progreso=None):
+    """Background job: load the country's history and fit the selected compartmental model to it"""
+    hist = cargar_historico(pais, dias)
+    if not hist:
+        raise ValueError(f"no hay histórico para {pais}")
+    fechas, cases, _ = hist
+    curr = get_country_current(pais) or {}
+    progreso(0.0, "datos cargados")
+    res = ajuste.ajustar_pais(modelo, pais, dias, fechas, cases, curr.get("population"), progreso)
+    return dict(res, modelo=modelo, pais=pais, fechas=fechas, datos=np.asarray(cases) - cases[0],
+                curva=ajuste.curva(modelo, res["params"], len(fechas)))
+
+def figura_ajuste(r):
+    p = r["params"]
+    fig = go.Figure()
+    fig.add_scatter(x=r["fechas"], y=r["datos"], mode="markers", name="Casos observados",
+                    marker=dict(color="rgba(255, 127, 80, 0.5)", size=5))
+    fig.add_scatter(x=r["fechas"], y=r["curva"], mode="lines", name=f"Modelo {r['modelo'].upper()}",
+                    line=dict(color="#002b45", width=3))
+    tasas = ",  ".join(f"{k} = {p[k]:.3f}" for k in ajuste.MODELOS[r["modelo"]].parametros)
+    fig.update_layout(
+        title=dict(text=f"{r['modelo'].upper()} ajustado a {r['pais']}<br><sup>{tasas},  "
+                        f"R₀ = {p['beta'] / p['gamma']:.2f},  N efectiva = {p['N']:,.0f}</sup>",
+                   x=0.5, xanchor="center"),
+        xaxis=dict(title="Fecha", type="date"),
+        yaxis_title="Casos desde el inicio de la ventana",
+        template="plotly_white",
+        font=dict(family="Segoe UI", size=13, color="#212529"),
+        margin=dict(l=60, r=30, t=80, b=50),
+        legend=dict(x=0.02, y=0.98)
+    )
+    return fig
+
+@callback(
+    Output("ajuste-trabajo", "data"),
+    Output("ajuste-intervalo", "disabled"),
+    Input("btn-ajustar", "n_clicks"),
+    State("covid-consulta", "data"),
+    State("ajuste-modelo", "value"),
+    State("ajuste-trabajo", "data"),
+    prevent_initial_call=True
+)
+def lanzar_ajuste(_, consulta, modelo, anterior):
+    if not consulta:
+        return no_update, True
+    return trabajos.lanzar(ajustar_modelo, modelo, consulta["pais"], consulta["dias"], reemplaza=anterior), False
+
+def ajuste_listo(r):
+    origen = "desde caché" if r["cache"] else f"{r['evaluaciones']} evaluaciones, RMSE {r['rmse']:,.0f} casos"
+    texto = f"Ajuste listo ({origen})." + (f" ⚠️ Poco fiable: {r['aviso']}." if r.get("aviso") else "")
+    return binario.binarizar(figura_ajuste(r)), texto
+
+trabajos.registrar_sondeo("ajuste", Output("grafica-ajuste", "figure"), ajuste_listo)
@@ -4,7 +4,10 @@ import plotly.graph_objects as go
 import requests
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
 import random
+from utils import binario, referencia
+from utils.paneles import mapas_de_calor
 
 dash.register_page(__name__, path="/clase8", name="Clase 8: Datos que Sudan")
 
@@ -19,18 +22,11 @@ MESSAGES = [
 WGER_URL = "https://wger.de/api/v2"
 
 def get_muscles():
-    
-    try:
-        r = requests.get(f"{WGER_URL}/muscle/?limit=30", timeout=5)
-        r.raise_for_status()
-        return [{"id": m["id"], "name": m["name_en"]} for m in r.json()["results"]]
-    except Exception as e:
-        print("API reposo – respaldo local:", e)
-        return [
-            {"id": 1, "name": "Chest"}, {"id": 2, "name": "Back"},
-            {"id": 3, "name": "Legs"}, {"id": 4, "name": "Shoulders"},
-            {"id": 5, "name": "Arms"}, {"id": 6, "name": "Core"}
-        ]
+    r = requests.get(f"{WGER_URL}/muscle/?limit=30", timeout=5)
+    r.raise_for_status()
+    return [{"id": m["id"], "name": m["name_en"]} for m in r.json()["results"]]
+
+referencia.registrar("musculos", get_muscles, intervalo=7 * 24 * 3600)
 
 def get_exercises_with_gif(muscle_id):
     
@@ -74,16 +70,62 @@ def get_sound_url():
 def calculate_1RM(peso, repeticiones):
     return peso * (1 + repeticiones/30)
 
-def muscle_activation(peso, reps, series, tempo, descanso, nivel):
-    one_rm = calculate_1RM(peso, reps)
+def muscle_activation(peso, reps, series, tempo, descanso, nivel, one_rm=None):
+    if one_rm is None:
+        one_rm = calculate_1RM(peso, reps)
     porcentaje_1rm = (peso / one_rm) * 100
     volumen = reps * series
     factor_tempo = 1 + (tempo - 2) * 0.1 
     factor_descanso = 1 + (90 - descanso) * 0.002  
     factor_nivel = {"principiante": 0.85, "intermedio": 1.0, "avanzado": 1.15}[nivel]
-    activacion = min(100, (porcentaje_1rm * 0.5 + volumen * 0.25 + factor_tempo * 10 + factor_descanso * 5) * factor_nivel)
+    activacion = np.minimum(100, (porcentaje_1rm * 0.5 + volumen * 0.25 + factor_tempo * 10 + factor_descanso * 5) * factor_nivel)
     return activacion, porcentaje_1rm, volumen
 
+PESO_MIN, PESO_MAX = 20, 200
+# Load as a fraction of 1RM; the plan is computed once on this axis and scaled to kg per user
+INTENSIDADES = np.round(np.arange(0.1, 1.0 + 1e-9, 0.0125), 4)
+REPS = np.arange(1, 21)
+SERIES = np.arange(1, 11)
+UMBRAL_HIPERTROFIA = 70
+
+@lru_cache(maxsize=64)
+def plan_entrenamiento(nivel, tempo, descanso):
+    F, R, S = np.meshgrid(INTENSIDADES, REPS, SERIES, indexing="ij")
+    activacion, porcentaje, _ = muscle_activation(F, R, S, tempo, descanso, nivel, one_rm=1.0)
+    # Epley: r reps are only possible while load * (1 + r/30) stays under the 1RM
+    factible = F * (1 + R / 30) <= 1
+    activacion = np.where(factible, activacion, np.nan)
+    hipertrofia = activacion > UMBRAL_HIPERTROFIA
+    series_min = np.where(hipertrofia.any(axis=2), SERIES[hipertrofia.argmax(axis=2)], np.nan)
+    plan = {"activacion": activacion, "porcentaje": np.where(factible[:, :, 0], porcentaje[:, :, 0], np.nan),
+            "hipertrofia": hipertrofia, "series_min": series_min}
+    # Shared between callbacks through the cache
+    for v in plan.values():
+        v.setflags(write=False)
+    return plan
+
+def figura_planificador(plan, series, one_rm):
+    pesos = INTENSIDADES * one_rm
+    visibles = (pesos >= PESO_MIN) & (pesos <= PESO_MAX)
+    pesos = np.round(pesos[visibles], 1)
+    paneles = [(plan["activacion"][visibles, :, series - 1], f"Activación (%) con {series} series", "Hot", "%"),
+               (plan["porcentaje"][visibles], "% de tu 1RM", "Blues", "%"),
+               (plan["series_min"][visibles], "Series mínimas para hipertrofia", "Viridis_r", " series")]
+    fig = mapas_de_calor(pesos, REPS, [
+        (binario.arreglo(z.T), titulo, escala,
+         f"peso %{{x}} kg<br>%{{y}} reps<br>{titulo}: %{{z:.0f}}{unidad}<extra></extra>")
+        for z, titulo, escala, unidad in paneles], "Peso (kg)", "Repeticiones")
+    zona = binario.arreglo(plan["hipertrofia"][visibles, :, series - 1].astype(float).T)
+    for k in (1, 2):
+        fig.add_trace(go.Contour(
+            x=pesos, y=REPS, z=zona, showscale=False, hoverinfo="skip",
+            contours=dict(start=0.5, end=0.5, coloring="none"), line=dict(color="#00e676", width=3)
+        ), row=1, col=k)
+    fig.update_annotations(font=dict(color="#FFD700"))
+    fig.update_layout(template="plotly_dark", paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+                      font=dict(color="#ffffff"), height=420)
+    return fig
+
 layout = html.Div(className="page-container gym-dark", children=[
 
     html.Div(className="gym-hero-premium", children=[
@@ -119,7 +161,7 @@ layout = html.Div(className="page-container gym-dark", children=[
                 html.Label("Grupo muscular", className="gym-input-label"),
                 dcc.Dropdown(
                     id="dd-muscle",
-                    options=[{"label": m["name"], "value": m["name"].lower()} for m in get_muscles()],
+                    options=[{"label": m["name"], "value": m["name"].lower()} for m in referencia.obtener("musculos")],
                     value="chest",
                     className="gym-input-field"
                 )
@@ -167,6 +209,13 @@ layout = html.Div(className="page-container gym-dark", children=[
         ])
     ]),
 
+    html.Div(className="gym-chart-card mt-4", children=[
+        html.H4("🗓️ PLANIFICADOR DE CARGA", className="gym-chart-title"),
+        html.P("Todas las combinaciones de peso × repeticiones × series a partir de tu 1RM estimado; "
+               "el contorno verde marca la zona de hipertrofia.", className="gym-audio-text"),
+        dcc.Graph(id="grafica-planificador", style={"height": "45vh"})
+    ]),
+
     html.Div(id="info-detallada", className="gym-analysis-section mt-4", children=[
         html.H4("📈 ANÁLISIS DETALLADO", className="gym-section-title"),
         html.Div(className="gym-analysis", children=[])
@@ -201,6 +250,7 @@ layout = html.Div(className="page-container gym-dark", children=[
     Output("grafica-radar", "figure"),
     Output("ejercicios-galeria", "children"),
     Output("info-detallada", "children"),
+    Output("grafica-planificador", "figure"),
     Input("btn-calcular", "n_clicks"),
     State("input-peso", "value"),
     State("input-edad", "value"),
@@ -215,7 +265,7 @@ layout = html.Div(className="page-container gym-dark", children=[
 def calcular_entrenamiento(_, peso_corporal, edad, nivel, peso_levantado, reps, series, tempo, descanso):
     if any(v is None for v in [peso_corporal, edad, peso_levantado, reps, series, tempo, descanso]):
         fig1 = go.Figure().add_annotation(text="Completa todos los campos", showarrow=False)
-        return fig1, go.Figure(), [], "Por favor completa todos los campos."
+        return fig1, go.Figure(), [], "Por favor completa todos los campos.", go.Figure()
 
     one_rm = calculate_1RM(peso_levantado, reps)
     activacion, porcentaje_1rm, volumen = muscle_activation(peso_levantado, reps, series, tempo, descanso, nivel)
@@ -308,7 +358,15 @@ def calcular_entrenamiento(_, peso_corporal, edad, nivel, peso_levantado, reps,
             html.Span(recomendacion, className="gym-text-rec")
         ])
     ])
-    return fig1, fig2, cards, info
+    plan = plan_entrenamiento(nivel, float(tempo), float(descanso))
+    return fig1, fig2, cards, info, binario.binarizar(figura_planificador(plan, int(series), float(one_rm)))
+
+@callback(
+    Output("dd-muscle", "options"),
+    Input("dd-muscle", "id")
+)
+def cargar_musculos(_):
+    return [{"label": m["name"], "value": m["name"].lower()} for m in referencia.obtener("musculos")]
 
 @callback(
     Output("gym-sound", "src"),
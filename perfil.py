@@ -0,0 +1,116 @@
+import argparse
+import functools
+import importlib.machinery
+import json
+import sys
+import time
+
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+
+METODOS_FIGURA = [
+    "__init__", "add_trace", "add_traces", "add_scatter", "add_annotation",
+    "add_shape", "add_hline", "add_vline", "update_layout", "update_xaxes",
+    "update_yaxes", "update_traces"
+]
+
+tiempos = {}
+_pila = []
+_en_figura = [0]
+
+
+def _medir_import(exec_module):
+    @functools.wraps(exec_module)
+    def envoltura(self, module):
+        if not module.__name__.startswith("pages."):
+            return exec_module(self, module)
+        _pila.append(module.__name__)
+        tiempos[module.__name__] = {"import_s": 0.0, "figuras_s": 0.0}
+        t0 = time.perf_counter()
+        try:
+            return exec_module(self, module)
+        finally:
+            tiempos[module.__name__]["import_s"] = time.perf_counter() - t0
+            _pila.pop()
+    return envoltura
+
+
+def _medir_figura(metodo):
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        if not _pila or _en_figura[0]:
+            return metodo(*args, **kwargs)
+        _en_figura[0] += 1
+        t0 = time.perf_counter()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            _en_figura[0] -= 1
+            tiempos[_pila[-1]]["figuras_s"] += time.perf_counter() - t0
+    return envoltura
+
+
+def instrumentar():
+    """Wrap page module execution and go.Figure builders with timers"""
+    loader = importlib.machinery.SourceFileLoader
+    loader.exec_module = _medir_import(loader.exec_module)
+    for nombre in METODOS_FIGURA:
+        setattr(go.Figure, nombre, _medir_figura(getattr(go.Figure, nombre)))
+
+
+def perfilar():
+    instrumentar()
+    t0 = time.perf_counter()
+    import app
+    import dash
+    total = time.perf_counter() - t0
+
+    paginas = []
+    for modulo, pagina in dash.page_registry.items():
+        layout = pagina["layout"]
+        medidas = tiempos.setdefault(modulo, {"import_s": 0.0, "figuras_s": 0.0})
+        t1 = time.perf_counter()
+        if callable(layout):
+            # Figures built inside a layout function count towards the page, as at import
+            _pila.append(modulo)
+            try:
+                layout = layout()
+            finally:
+                _pila.pop()
+        construccion = time.perf_counter() - t1
+        t1 = time.perf_counter()
+        texto = to_json_plotly(layout)
+        serializacion = time.perf_counter() - t1
+        paginas.append({
+            "modulo": modulo,
+            "path": pagina["path"],
+            "import_s": round(medidas["import_s"], 6),
+            "layout_s": round(construccion, 6),
+            "figuras_s": round(medidas["figuras_s"], 6),
+            "layout_bytes": len(texto.encode("utf-8")),
+            "serializacion_s": round(serializacion, 6)
+        })
+
+    return {
+        "python": sys.version.split()[0],
+        "dash": dash.__version__,
+        "import_app_s": round(total, 6),
+        "paginas": paginas
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perfil de arranque y construcción de páginas de DASH-TM")
+    parser.add_argument("-o", "--output", help="archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args(argv)
+
+    reporte = json.dumps(perfilar(), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(reporte + "\n")
+    else:
+        print(reporte)
+
+
+if __name__ == "__main__":
+    main()
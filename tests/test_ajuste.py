@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from utils import ajuste
+
+
+def test_recupera_parametros_sinteticos():
+    verdad = {"beta": 0.4, "gamma": 0.1, "N": 20000.0, "I0": 20.0}
+    casos = ajuste.curva("sir", verdad, 60) + 1000
+    res = ajuste.ajustar("sir", casos, poblacion=1e6)
+    for p, v in verdad.items():
+        assert res["params"][p] == pytest.approx(v, rel=1e-3)
+    assert ajuste.revisar(res["params"], casos) is None
+
+
+def test_rechaza_datos_planos():
+    with pytest.raises(ValueError):
+        ajuste.ajustar("sir", np.full(30, 500.0), poblacion=1e6)
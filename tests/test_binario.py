@@ -0,0 +1,32 @@
+import base64
+
+import numpy as np
+import pytest
+
+from utils import binario
+
+
+def decodificar(spec):
+    arr = np.frombuffer(base64.b64decode(spec["bdata"]), dtype="<" + spec["dtype"])
+    if "shape" in spec:
+        arr = arr.reshape([int(n) for n in spec["shape"].split(",")])
+    return arr
+
+
+@pytest.mark.parametrize("valores,dtype", [
+    (np.arange(100), "u1"),
+    (np.arange(-300, 300), "i2"),
+    (np.linspace(0, 1, 100), "f4"),
+    (np.arange(12.0).reshape(3, 4), "f4"),
+])
+def test_ida_y_vuelta(valores, dtype):
+    spec = binario.codificar(valores)
+    assert spec["dtype"] == dtype
+    np.testing.assert_allclose(decodificar(spec), valores, rtol=1e-6)
+
+
+def test_fechas_como_milisegundos():
+    fechas = np.datetime64("2021-03-01") + np.arange(3)
+    spec = binario.codificar(fechas)
+    assert spec["dtype"] == "f8"
+    np.testing.assert_array_equal(decodificar(spec).astype("datetime64[ms]"), fechas)
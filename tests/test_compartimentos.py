@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+
+from utils.compartimentos import SEIR, SIR
+
+T = np.linspace(0, 160, 400)
+
+
+def sir(y, t, N, beta, gamma):
+    S, I, R = y
+    return [-beta * S * I / N, beta * S * I / N - gamma * I, gamma * I]
+
+
+def seir(y, t, N, beta, sigma, gamma):
+    S, E, I, R = y
+    return [-beta * S * I / N, beta * S * I / N - sigma * E, sigma * E - gamma * I, gamma * I]
+
+
+def test_sir_coincide_con_el_rhs_escrito_a_mano():
+    esperado = odeint(sir, [990, 10, 0], T, args=(1000, 0.5, 0.1)).T
+    np.testing.assert_allclose(SIR.resolver([990, 10, 0], T, 1000, beta=0.5, gamma=0.1), esperado, atol=1e-8)
+
+
+def test_seir_coincide_con_el_rhs_escrito_a_mano():
+    esperado = odeint(seir, [990, 0, 10, 0], T, args=(1000, 0.5, 0.33, 0.1)).T
+    obtenido = SEIR.resolver([990, 0, 10, 0], T, 1000, beta=0.5, sigma=0.33, gamma=0.1)
+    np.testing.assert_allclose(obtenido, esperado, atol=1e-8)
+
+
+def test_rhs_escalar_y_apilado_coinciden():
+    y = np.array([700.0, 50.0, 200.0, 50.0])
+    params = dict(beta=0.4, sigma=0.3, gamma=0.1)
+    np.testing.assert_allclose(SEIR.rhs_escalar(y, 0.0, 1000.0, (0.4, 0.3, 0.1)), SEIR.derivadas(y, 1000, **params))
+
+
+def test_conserva_la_poblacion():
+    assert sum(SIR.rhs_escalar(np.array([990.0, 10.0, 0.0]), 0.0, 1000.0, (0.5, 0.1))) == pytest.approx(0)
+
+
+def test_paso_rk4_apilado():
+    B, G = np.meshgrid([0.2, 0.5, 0.9], [0.1, 0.3], indexing="ij")
+    y = np.empty((3,) + B.shape)
+    y[0], y[1], y[2] = 990, 10, 0
+    paso = SIR.paso_rk4(y, 0.25, 1000, beta=B, gamma=G)
+    assert paso.shape == y.shape
+    uno = SIR.paso_rk4(np.array([990.0, 10, 0]), 0.25, 1000, beta=0.5, gamma=0.3)
+    np.testing.assert_allclose(paso[:, 1, 1], uno)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from utils import covid_analisis
+
+
+def test_parsear_fechas():
+    fechas = covid_analisis.parsear_fechas(["1/22/20", "12/3/21"])
+    assert fechas.tolist() == [np.datetime64("2020-01-22").item(), np.datetime64("2021-12-03").item()]
+
+
+def test_serie_alinea_campos_de_distinto_largo():
+    timeline = {"cases": {"1/1/21": 1, "1/2/21": 2, "1/3/21": 3},
+                "deaths": {"1/2/21": 0, "1/3/21": 1},
+                "recovered": {}}
+    fechas, campos = covid_analisis.serie(timeline)
+    assert str(fechas[0]) == "2021-01-02" and len(fechas) == 2
+    assert set(campos) == {"cases", "deaths"}
+    assert campos["cases"].tolist() == [2, 3] and campos["deaths"].tolist() == [0, 1]
+
+
+def test_serie_sin_casos():
+    fechas, campos = covid_analisis.serie({"deaths": {"1/1/21": 1}})
+    assert len(fechas) == 0 and campos == {}
+
+
+def test_media_movil_promedia_lo_disponible_al_inicio():
+    np.testing.assert_allclose(covid_analisis.media_movil([3, 6, 9, 12], 2), [3, 4.5, 7.5, 10.5])
+
+
+def test_indicadores_de_un_crecimiento_exponencial():
+    r = 0.05
+    acumulados = np.exp(r * np.arange(120))
+    res = covid_analisis.indicadores(acumulados, tg=5.0)
+    assert res["rt"][-1] == pytest.approx(1 + r * 5.0, rel=1e-3)
+    assert res["duplicacion"][-1] == pytest.approx(np.log(2) / r, rel=1e-3)
+    assert np.isnan(res["rt"][:7]).all()
+
+
+def test_correcciones_negativas_no_son_casos_nuevos():
+    res = covid_analisis.indicadores([10, 20, 15, 30])
+    assert res["nuevos"].tolist() == [0, 10, 0, 15]
+
+
+def test_decrecimiento_no_tiene_duplicacion():
+    res = covid_analisis.indicadores(np.cumsum(np.exp(-0.05 * np.arange(60))))
+    assert np.isinf(res["duplicacion"][-1]) and res["rt"][-1] < 1
@@ -0,0 +1,86 @@
+import pytest
+import requests
+
+from utils.covid_api import ClienteCovid
+
+
+class Respuesta:
+    def __init__(self, status_code, datos=None, headers=None):
+        self.status_code = status_code
+        self.datos = datos
+        self.headers = headers or {}
+
+    def json(self):
+        return self.datos
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+
+class Sesion:
+    def __init__(self, *respuestas):
+        self.respuestas = list(respuestas)
+        self.pedidas = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.pedidas.append((url, params, headers))
+        return self.respuestas.pop(0)
+
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    monkeypatch.delenv("DASH_TM_SIN_RED", raising=False)
+    return ClienteCovid(base="https://ejemplo", directorio=str(tmp_path))
+
+
+def test_fallo_en_frio_pide_y_guarda(cliente):
+    cliente.sesion = Sesion(Respuesta(200, {"cases": 1}, {"ETag": "a"}))
+    assert cliente.actual("USA") == {"cases": 1}
+    assert cliente.actual("USA") == {"cases": 1}
+    assert len(cliente.sesion.pedidas) == 1
+
+
+def test_cache_en_disco_sobrevive_al_proceso(cliente, tmp_path):
+    cliente.sesion = Sesion(Respuesta(200, [1, 2, 3]))
+    cliente.historico("USA", 30)
+    otro = ClienteCovid(base="https://ejemplo", directorio=str(tmp_path))
+    otro.sesion = Sesion()
+    assert otro.historico("USA", 30) == [1, 2, 3]
+
+
+def test_lru_en_memoria_acotado(cliente):
+    cliente.max_memoria = 2
+    cliente.sesion = Sesion(*(Respuesta(200, {"pais": p}) for p in "abc"))
+    for p in "abc":
+        cliente.actual(p)
+    assert len(cliente._memoria) == 2
+
+
+def test_vencido_se_sirve_y_se_revalida_con_cabeceras(cliente):
+    cliente.sesion = Sesion(Respuesta(200, {"cases": 1}, {"ETag": "a", "Last-Modified": "ayer"}),
+                            Respuesta(304, headers={"ETag": "b"}))
+    cliente.actual("USA")
+    cliente.ttl["actual"] = -1
+    assert cliente.actual("USA") == {"cases": 1}
+    cliente._fondo.shutdown(wait=True)
+    _, _, cabeceras = cliente.sesion.pedidas[1]
+    assert cabeceras == {"If-None-Match": "a", "If-Modified-Since": "ayer"}
+    entrada = cliente._leer(cliente._clave("countries/USA", None))
+    assert entrada.datos == {"cases": 1} and entrada.etag == "b"
+
+
+def test_error_de_revalidacion_conserva_lo_guardado(cliente):
+    cliente.sesion = Sesion(Respuesta(200, {"cases": 1}), Respuesta(500))
+    cliente.actual("USA")
+    cliente.ttl["actual"] = -1
+    cliente.actual("USA")
+    cliente._fondo.shutdown(wait=True)
+    assert cliente._leer(cliente._clave("countries/USA", None)).datos == {"cases": 1}
+    assert not cliente._revalidando
+
+
+def test_sin_red_el_fallo_en_frio_lanza(cliente, monkeypatch):
+    monkeypatch.setenv("DASH_TM_SIN_RED", "1")
+    with pytest.raises(requests.ConnectionError):
+        cliente.paises()
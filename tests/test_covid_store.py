@@ -0,0 +1,80 @@
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+from utils import covid_store
+
+
+def respuesta(paises, desde, dias, base=100):
+    """Bulk /historical payload: country i has base + 10*i + day-of-year cumulative cases"""
+    fechas = np.datetime64("2023-01-01") + desde + np.arange(dias)
+    claves = [f"{d.month}/{d.day}/{d.year % 100}" for d in fechas.astype(object)]
+    return [{"country": p, "timeline": {c: {k: base + 10 * i + desde + j for j, k in enumerate(claves)}
+                                        for c in covid_store.CAMPOS}}
+            for i, p in enumerate(paises)]
+
+
+@pytest.fixture
+def almacen(tmp_path, monkeypatch):
+    monkeypatch.setattr(covid_store, "STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(covid_store, "INDICE", str(tmp_path / "indice.json"))
+    monkeypatch.setitem(covid_store._abierto, "mtime", None)
+    estado = {"respuesta": None, "ultimo": None, "lastdays": []}
+
+    def descargar(lastdays, timeout=120):
+        estado["lastdays"].append(lastdays)
+        return estado["respuesta"]
+
+    monkeypatch.setattr(covid_store, "_descargar", descargar)
+    monkeypatch.setattr(covid_store, "_ultimo_remoto", lambda timeout=30: np.datetime64(estado["ultimo"]))
+    return estado
+
+
+def test_sincronizacion_incremental(almacen):
+    almacen["respuesta"] = respuesta(["A", "B"], 0, 5)
+    covid_store.sincronizar(completo=True)
+
+    # Upstream is three days ahead; B is missing from the incremental response
+    almacen["ultimo"] = "2023-01-08"
+    almacen["respuesta"] = respuesta(["A", "C"], 4, 4)
+    resumen = covid_store.sincronizar()
+
+    assert almacen["lastdays"] == ["all", 4]
+    assert resumen == {"paises": 3, "dias": 8, "descargados": 4, "ultimo": "2023-01-08"}
+    fechas, a = covid_store.historico("A")
+    assert fechas[0] == np.datetime64("2023-01-01") and len(fechas) == 8
+    np.testing.assert_array_equal(a["cases"], 100 + np.arange(8))
+    _, b = covid_store.historico("B")
+    np.testing.assert_array_equal(b["cases"], [110, 111, 112, 113, 114, 114, 114, 114])
+    _, c = covid_store.historico("C", dias=4)
+    np.testing.assert_array_equal(c["deaths"], 110 + np.arange(4, 8))
+
+
+def test_almacen_ilegible_hace_sincronizacion_completa(almacen, tmp_path):
+    almacen["respuesta"] = respuesta(["A"], 0, 5)
+    covid_store.sincronizar(completo=True)
+    (tmp_path / "cases.npy").write_bytes(b"roto")
+    os.utime(tmp_path / "indice.json", (time.time() + 5, time.time() + 5))
+
+    almacen["ultimo"] = "2023-01-05"
+    covid_store.sincronizar()
+    assert almacen["lastdays"] == ["all", "all"]
+    _, a = covid_store.historico("A")
+    assert len(a["cases"]) == 5
+
+
+def test_almacen_vencido_se_sirve_y_se_sincroniza(almacen, tmp_path, monkeypatch):
+    almacen["respuesta"] = respuesta(["A"], 0, 5)
+    covid_store.sincronizar(completo=True)
+    indice = json.loads((tmp_path / "indice.json").read_text())
+    indice["sincronizado"] -= covid_store.VIGENCIA + 1
+    (tmp_path / "indice.json").write_text(json.dumps(indice))
+    os.utime(tmp_path / "indice.json", (time.time() + 5, time.time() + 5))
+    sincronizaciones = []
+    monkeypatch.setattr(covid_store, "sincronizar_en_segundo_plano", lambda: sincronizaciones.append(1))
+    fechas, campos = covid_store.historico("A")
+    assert len(fechas) == 5 and len(campos["cases"]) == 5
+    assert sincronizaciones == [1]
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from utils.expresiones import ErrorExpresion, compilar
+
+X, Y = np.meshgrid(np.linspace(-2, 2, 5), np.linspace(-1, 1, 5))
+
+
+@pytest.mark.parametrize("expresion", [
+    "__import__('os').system('true')",
+    "X.__class__",
+    "np.load('datos.npy')",
+    "open('f')",
+    "lambda: X",
+    "[x for x in Y]",
+    "X if Y else X",
+    "sin(X, out=Y)",
+    "'texto'",
+    "True + X",
+    "os",
+])
+def test_rechaza_fuera_de_la_lista(expresion):
+    with pytest.raises(ErrorExpresion):
+        compilar(expresion)
+
+
+def test_columna_sobre_el_texto_original():
+    with pytest.raises(ErrorExpresion) as e:
+        compilar("  X +  foo")
+    assert e.value.columna == 7
+    assert "«foo»" in str(e.value)
+
+
+def test_evalua_con_numpy():
+    res = compilar("np.sin(X) * Y + pi")(X, Y)
+    np.testing.assert_allclose(res, np.sin(X) * Y + np.pi)
+
+
+def test_constante_se_expande_a_la_malla():
+    assert compilar("2")(X, Y).shape == X.shape
+
+
+@pytest.mark.parametrize("expresion", ["sin", "(-1) ** 0.5"])
+def test_resultado_no_numerico(expresion):
+    with pytest.raises(ErrorExpresion):
+        compilar(expresion)(X, Y)
+
+
+def test_se_analiza_una_vez_por_expresion():
+    from utils import expresiones
+    expresiones._compilar.cache_clear()
+    primera = compilar("sin(X) + Y")
+    for variante in ["sin(X) + Y", "  sin(X) + Y", "sin(X) + Y\n", "\tsin(X) + Y "]:
+        assert compilar(variante) is primera
+    info = expresiones._compilar.cache_info()
+    assert (info.misses, info.hits) == (1, 4)
+
+
+def test_los_errores_no_se_guardan_en_cache():
+    for sangria in ["", "   "]:
+        with pytest.raises(ErrorExpresion) as e:
+            compilar(sangria + "X + foo")
+        assert e.value.columna == len(sangria) + 4
+        assert e.value.expresion == sangria + "X + foo"
@@ -0,0 +1,66 @@
+import pytest
+
+from utils import memo
+
+
+@pytest.fixture
+def memoria(monkeypatch):
+    cache = memo.CacheMemoria(10_000)
+    monkeypatch.setattr(memo, "_memoria", cache)
+    return cache
+
+
+def nuevo(nombre, **opciones):
+    return memo.Memo(nombre, backend="memoria", **opciones)
+
+
+def test_normalizar_unifica_enteros_y_flotantes():
+    assert memo.normalizar(3.0) == memo.normalizar(3) == 3
+    assert memo.normalizar(0.1 + 0.2) == memo.normalizar(0.3)
+    assert memo.normalizar({"b": [1, 2.0], "a": None}) == (("a", None), ("b", (1, 2)))
+
+
+def test_cuenta_aciertos_y_fallos(memoria):
+    llamadas = []
+    cuadrado = nuevo("test-cuenta")(lambda x: llamadas.append(x) or x * x)
+    assert [cuadrado(3), cuadrado(3.0), cuadrado(4)] == [9, 9, 16]
+    assert llamadas == [3, 4]
+    assert cuadrado.memo.estadisticas()["aciertos"] == 1
+    assert cuadrado.memo.estadisticas()["fallos"] == 2
+
+
+def test_memos_comparten_presupuesto_sin_mezclar_claves(memoria):
+    a = nuevo("test-a")(lambda x: ("a", x))
+    b = nuevo("test-b")(lambda x: ("b", x))
+    assert a(1) == ("a", 1) and b(1) == ("b", 1)
+    assert a.memo.memoria is b.memo.memoria is memoria
+    assert memoria.bytes > 0
+
+
+def test_lru_respeta_el_limite_de_bytes():
+    cache = memo.CacheMemoria(100)
+    for k in range(10):
+        cache.guardar(k, k, 30)
+    assert cache.bytes <= 100
+    assert cache.obtener(0) is None and cache.obtener(9) == 9
+    cache.guardar("grande", 0, 101)
+    assert cache.obtener("grande") is None
+
+
+def test_argumentos_ignorados_no_forman_parte_de_la_clave(memoria):
+    avisos = []
+    calcular = nuevo("test-ignorar", ignorar=("progreso",))(lambda n, progreso=None: progreso(n) or n)
+    assert calcular(2, progreso=avisos.append) == 2
+    assert calcular(2, progreso=lambda _: pytest.fail("debería venir de la caché")) == 2
+    assert avisos == [2]
+
+
+def test_disco_compartido(tmp_path, memoria):
+    disco = memo.CacheDisco(str(tmp_path / "memo.sqlite"), 10_000)
+    m = nuevo("test-disco")
+    m.disco = disco
+    f = m(lambda x: [x] * 3)
+    assert f(5) == [5, 5, 5]
+    memoria._datos.clear()
+    assert f(5) == [5, 5, 5]
+    assert m.estadisticas()["aciertos"] == 1
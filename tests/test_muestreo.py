@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from utils import muestreo
+
+
+@pytest.mark.parametrize("n", [3, 10, 257, 999])
+def test_lttb_indices_crecientes(n):
+    rng = np.random.default_rng(n)
+    x = np.arange(5000, dtype=float)
+    y = np.cumsum(rng.normal(size=5000))
+    idx = muestreo.lttb(x, y, n)
+    assert len(idx) == n
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_no_reduce_series_cortas():
+    np.testing.assert_array_equal(muestreo.lttb(np.arange(5), np.arange(5), 10), np.arange(5))
+
+
+def test_lttb_conserva_el_pico():
+    y = np.zeros(10000)
+    y[4321] = 1.0
+    assert 4321 in muestreo.lttb(np.arange(10000), y, 100)
+
+
+def test_minmax_indices_crecientes():
+    y = np.sin(np.linspace(0, 50, 10000))
+    idx = muestreo.minmax(y, 200)
+    assert np.all(np.diff(idx) > 0)
+    assert y[idx].max() == y.max() and y[idx].min() == y.min()
+
+
+def test_reducir_fechas_al_presupuesto():
+    x = np.datetime64("2020-01-01") + np.arange(20000)
+    ys = [np.arange(20000), np.arange(20000)[::-1]]
+    xr, (a, b) = muestreo.reducir(x, ys, ancho=500)
+    assert len(xr) == len(a) == len(b) <= muestreo.max_puntos(500)
+    assert xr.dtype == x.dtype and np.all(np.diff(xr) > np.timedelta64(0))
+
+
+def test_ventana_x():
+    assert muestreo.ventana_x({"autosize": True}) is None
+    assert muestreo.ventana_x({"xaxis.autorange": True}) == "auto"
+    assert muestreo.ventana_x({"xaxis.range[0]": 1, "xaxis.range[1]": 5}) == (1, 5)
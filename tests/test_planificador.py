@@ -0,0 +1,57 @@
+import dash
+import numpy as np
+import pytest
+
+from utils.paneles import mapas_de_calor
+
+
+@pytest.fixture(scope="module")
+def clase8():
+    dash.Dash(__name__, use_pages=True, pages_folder="")
+    from pages import clase8
+    return clase8
+
+
+def test_plan_solo_marca_cargas_factibles(clase8):
+    plan = clase8.plan_entrenamiento("intermedio", 2, 90)
+    F, R = np.meshgrid(clase8.INTENSIDADES, clase8.REPS, indexing="ij")
+    imposible = F * (1 + R / 30) > 1
+    assert np.isnan(plan["porcentaje"][imposible]).all()
+    assert np.isnan(plan["activacion"][imposible]).all()
+    assert not plan["hipertrofia"][imposible].any()
+    assert np.isfinite(plan["porcentaje"][~imposible]).all()
+
+
+def test_plan_se_cachea_sin_el_peso_del_usuario(clase8):
+    clase8.plan_entrenamiento.cache_clear()
+    plan = clase8.plan_entrenamiento("avanzado", 3, 60)
+    assert clase8.plan_entrenamiento("avanzado", 3, 60) is plan
+    assert clase8.plan_entrenamiento.cache_info().hits == 1
+    with pytest.raises(ValueError):
+        plan["activacion"][0, 0, 0] = 0
+
+
+def test_series_minimas_cruzan_el_umbral(clase8):
+    plan = clase8.plan_entrenamiento("intermedio", 2, 90)
+    i, r = np.argwhere(np.isfinite(plan["series_min"]))[0]
+    s = int(plan["series_min"][i, r])
+    assert plan["activacion"][i, r, s - 1] > clase8.UMBRAL_HIPERTROFIA
+    assert s == 1 or plan["activacion"][i, r, s - 2] <= clase8.UMBRAL_HIPERTROFIA
+
+
+def test_figura_escala_el_eje_de_peso_con_el_1rm(clase8):
+    plan = clase8.plan_entrenamiento("intermedio", 2, 90)
+    fig = clase8.figura_planificador(plan, 3, 100.0)
+    pesos = np.asarray(fig.data[0].x)
+    assert pesos.min() >= clase8.PESO_MIN and pesos.max() <= clase8.PESO_MAX
+    np.testing.assert_allclose(pesos, np.round(clase8.INTENSIDADES[clase8.INTENSIDADES * 100 >= 20] * 100, 1))
+
+
+def test_mapas_de_calor_colocan_cada_barra_junto_a_su_panel():
+    z = np.zeros((2, 3))
+    fig = mapas_de_calor([0, 1, 2], [0, 1], [(z, f"panel {k}", "Reds", "") for k in range(3)], "x", "y")
+    barras = [t.colorbar.x for t in fig.data]
+    dominios = [fig.layout[f"xaxis{k}" if k > 1 else "xaxis"].domain for k in (1, 2, 3)]
+    for x, (_, fin) in zip(barras, dominios):
+        assert x == pytest.approx(fin + 0.005)
+    assert [a.text for a in fig.layout.annotations] == ["panel 0", "panel 1", "panel 2"]
@@ -0,0 +1,52 @@
+import json
+import time
+
+import pytest
+
+from utils import referencia
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    datos = tmp_path / "data"
+    datos.mkdir()
+    (datos / "paises.json").write_text(json.dumps(["A", "B"]))
+    monkeypatch.setattr(referencia, "DATA_DIR", str(datos))
+    monkeypatch.setattr(referencia, "REFERENCIA_DIR", str(tmp_path / "referencia"))
+    return tmp_path
+
+
+def falla():
+    raise OSError("sin red")
+
+
+def test_sin_cache_se_usa_la_instantanea(dirs):
+    ds = referencia.Dataset("paises", falla, 60)
+    assert ds.valor == ["A", "B"] and ds.origen == "instantanea" and ds.actualizado is None
+
+
+def test_refresco_fallido_conserva_el_valor(dirs):
+    ds = referencia.Dataset("paises", falla, 3600)
+    assert ds.refrescar() is False
+    assert ds.valor == ["A", "B"]
+    assert time.time() < ds.proximo <= time.time() + referencia.REINTENTO
+
+
+def test_respuesta_vacia_cuenta_como_fallo(dirs):
+    ds = referencia.Dataset("paises", lambda: [], 60)
+    assert ds.refrescar() is False and ds.valor == ["A", "B"]
+
+
+def test_refresco_se_guarda_y_se_recarga(dirs):
+    ds = referencia.Dataset("paises", lambda: ["C"], 60)
+    assert ds.refrescar() is True and ds.origen == "red"
+    otro = referencia.Dataset("paises", falla, 60)
+    assert otro.valor == ["C"] and otro.origen == "cache"
+
+
+def test_error_al_escribir_conserva_el_valor_nuevo(dirs, monkeypatch):
+    (dirs / "bloqueado").write_text("")
+    monkeypatch.setattr(referencia, "REFERENCIA_DIR", str(dirs / "bloqueado"))
+    ds = referencia.Dataset("paises", lambda: ["C"], 60)
+    assert ds.refrescar() is True
+    assert ds.valor == ["C"] and ds.origen == "red"
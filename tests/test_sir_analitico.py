@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from scipy.integrate import odeint
+
+from utils.sir_analitico import resumen_sir
+
+
+def sir(y, t, N, beta, gamma):
+    S, I, R = y
+    return [-beta * S * I / N, beta * S * I / N - gamma * I, gamma * I]
+
+
+@pytest.mark.parametrize("beta,gamma", [(0.4, 0.1), (0.3, 0.2), (1.0, 0.05)])
+def test_tamano_final_lambert_w(beta, gamma):
+    N, I0 = 1000.0, 10.0
+    res = resumen_sir(beta, gamma, N, I0)
+    s0, i0, R0 = (N - I0) / N, I0 / N, beta / gamma
+    s_inf = 1 - res["final"]
+    # Final-size relation: ln(s_inf / s0) = -R0 (s0 + i0 - s_inf)
+    assert np.log(s_inf / s0) == pytest.approx(-R0 * (s0 + i0 - s_inf), rel=1e-9)
+
+    sol = odeint(sir, [N - I0, I0, 0], np.linspace(0, 2000, 4001), args=(N, beta, gamma))
+    assert res["final"] == pytest.approx(1 - sol[-1, 0] / N, abs=1e-4)
+    assert float(res["pico"]) == pytest.approx(sol[:, 1].max(), rel=1e-3)
+
+
+def test_sin_epidemia_por_debajo_del_umbral():
+    res = resumen_sir(0.05, 0.1, 1000, 10)
+    assert float(res["pico"]) == pytest.approx(10)
+    assert float(res["umbral"]) == 0
+
+
+def test_difunde_sobre_mallas():
+    B, G = np.meshgrid(np.linspace(0.1, 1, 4), np.linspace(0.05, 0.5, 3), indexing="ij")
+    res = resumen_sir(B, G, 1000, 10)
+    assert res["final"].shape == res["pico"].shape == (4, 3)
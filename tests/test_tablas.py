@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from utils import tablas
+from utils.compartimentos import SIR
+
+T = np.linspace(0, 160, 400)
+
+
+@pytest.fixture
+def tabla_pequena(tmp_path, monkeypatch):
+    monkeypatch.setattr(tablas, "TABLAS_DIR", str(tmp_path))
+    monkeypatch.setitem(tablas.TABLAS, "sir", dict(tablas.TABLAS["sir"], ejes={
+        "beta": tablas.rejilla(0.3, 0.5, 0.1), "gamma": tablas.rejilla(0.1, 0.2, 0.1)}))
+    monkeypatch.setattr(tablas, "_abiertas", {})
+
+
+def test_sin_tabla_se_resuelve_la_ode(tabla_pequena):
+    assert tablas.buscar("sir", [990, 10, 0], T, 1000, beta=0.4, gamma=0.1) is None
+    np.testing.assert_allclose(tablas.resolver("sir", [990, 10, 0], T, 1000, beta=0.4, gamma=0.1),
+                               SIR.resolver([990, 10, 0], T, 1000, beta=0.4, gamma=0.1))
+
+
+def test_la_tabla_se_usa_en_cuanto_existe(tabla_pequena):
+    assert tablas.buscar("sir", [990, 10, 0], T, 1000, beta=0.4, gamma=0.1) is None
+    tablas.precalcular("sir")
+    sol = tablas.buscar("sir", [990, 10, 0], T, 1000, beta=0.4, gamma=0.1)
+    assert sol is not None and sol.shape == (3, 400)
+    np.testing.assert_allclose(sol, SIR.resolver([990, 10, 0], T, 1000, beta=0.4, gamma=0.1), rtol=1e-5, atol=1e-3)
+
+
+def test_fuera_de_la_rejilla_no_hay_tabla(tabla_pequena):
+    tablas.precalcular("sir")
+    assert tablas.buscar("sir", [990, 10, 0], T, 1000, beta=0.45, gamma=0.1) is None
+    assert tablas.buscar("sir", [990, 10, 0], T, 2000, beta=0.4, gamma=0.1) is None
+    assert tablas.buscar("sir", [980, 20, 0], T, 1000, beta=0.4, gamma=0.1) is None
+
+
+def test_tabla_con_otra_firma_se_ignora(tabla_pequena, monkeypatch):
+    tablas.precalcular("sir")
+    monkeypatch.setitem(tablas.TABLAS, "sir", dict(tablas.TABLAS["sir"], N=1001))
+    assert tablas._abrir("sir") is None
+
+
+def test_rejilla_incluye_el_valor_por_defecto_de_sigma():
+    assert np.any(np.isclose(tablas.TABLAS["seir"]["ejes"]["sigma"], 0.33))
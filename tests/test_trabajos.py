@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from utils import trabajos
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    return trabajos.AlmacenTrabajos(str(tmp_path / "trabajos.sqlite"))
+
+
+def envejecer(almacen, id_trabajo, segundos, estado=None):
+    almacen._conexion().execute("UPDATE trabajos SET actualizado = ?, estado = COALESCE(?, estado) WHERE id = ?",
+                                (time.time() - segundos, estado, id_trabajo))
+
+
+def test_deduplica_trabajos_identicos(almacen):
+    id_trabajo, nuevo = almacen.crear("clave")
+    assert nuevo
+    assert almacen.crear("clave") == (id_trabajo, False)
+
+
+def test_pendiente_en_cola_no_caduca(almacen):
+    id_trabajo, _ = almacen.crear("clave")
+    envejecer(almacen, id_trabajo, trabajos.LATIDO + 10)
+    assert almacen.crear("clave") == (id_trabajo, False)
+    assert almacen.obtener(id_trabajo).estado == "pendiente"
+
+
+def test_corriendo_sin_latido_se_marca_error(almacen):
+    id_trabajo, _ = almacen.crear("clave")
+    envejecer(almacen, id_trabajo, trabajos.LATIDO + 10, "corriendo")
+    nuevo_id, nuevo = almacen.crear("clave")
+    assert nuevo and nuevo_id != id_trabajo
+    assert almacen.obtener(id_trabajo).estado == "error"
+
+
+def test_cancelar_pendiente(almacen):
+    id_trabajo, _ = almacen.crear("clave")
+    almacen.cancelar(id_trabajo)
+    assert almacen.cancelado(id_trabajo)
+    assert almacen.obtener(id_trabajo).estado == "cancelado"
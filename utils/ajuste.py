@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+
+import numpy as np
+from scipy.optimize import least_squares
+
+from utils.compartimentos import SEIR, SIR
+from utils.referencia import CACHE_DIR
+
+AJUSTES_PATH = os.path.join(CACHE_DIR, "ajustes.json")
+
+MODELOS = {"sir": SIR, "seir": SEIR}
+LIMITES = {"beta": (0.01, 3.0), "sigma": (0.05, 1.0), "gamma": (0.02, 1.0)}
+INICIAL = {"beta": 0.3, "sigma": 0.2, "gamma": 0.1}
+# Below this many new cases in the window there is no epidemic curve to fit
+MIN_CASOS = 50
+
+_lock = threading.Lock()
+
+
+def _leer():
+    try:
+        with open(AJUSTES_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar(clave, params, modelo, pais):
+    with _lock:
+        ajustes = _leer()
+        ajustes[clave] = params
+        ajustes[f"{modelo}|{pais}"] = params
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{AJUSTES_PATH}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(ajustes, f)
+        os.replace(tmp, AJUSTES_PATH)
+
+
+def curva(modelo, params, n):
+    """New infections since day 0 predicted by a fitted parameter set, for n days"""
+    m = MODELOS[modelo]
+    N, I0 = params["N"], params["I0"]
+    # SEIR starts with as many exposed as infectious; both count as not-yet-reported at t=0
+    y0 = [N - I0, I0, 0] if modelo == "sir" else [N - 2 * I0, I0, I0, 0]
+    sol = m.resolver(y0, np.arange(n, dtype=float), N, **{p: params[p] for p in m.parametros})
+    sin_reportar = sol[0] if modelo == "sir" else sol[0] + sol[1]
+    return sin_reportar[0] - sin_reportar
+
+
+def ajustar(modelo, acumulados, poblacion, inicio=None, progreso=None, max_evaluaciones=300):
+    """Bounded least-squares fit of SIR/SEIR to a cumulative case series.
+
+    Fits the epidemiological rates plus the initial infectious count I0 and
+    the effective susceptible population N (between the observed total and
+    the country population), all in log space so the scales are comparable.
+    `inicio` is a previous fit used as warm start.
+    """
+    datos = np.asarray(acumulados, dtype=float)
+    datos = datos - datos[0]
+    n = len(datos)
+    if n < 2 or datos[-1] < MIN_CASOS:
+        raise ValueError(f"la ventana tiene {max(datos[-1], 0):,.0f} casos nuevos; se necesitan al menos {MIN_CASOS}")
+    escala = max(datos[-1], 1.0)
+    tasas = MODELOS[modelo].parametros
+    nombres = tasas + ["I0", "N"]
+
+    n_min = datos[-1] + 1.0
+    n_max = max(float(poblacion or 0), n_min * 10)
+    bajo = np.log([LIMITES[p][0] for p in tasas] + [1.0, n_min])
+    alto = np.log([LIMITES[p][1] for p in tasas] + [max(escala, 2.0), n_max])
+    x0 = [INICIAL[p] for p in tasas] + [max(datos[min(7, n - 1)] / 7, 1.0), min(n_min * 3, n_max)]
+    if inicio:
+        x0 = [inicio.get(p, v) for p, v in zip(nombres, x0)]
+    x0 = np.clip(np.log(x0), np.nextafter(bajo, np.inf), np.nextafter(alto, -np.inf))
+
+    # Finite-difference Jacobians cost len(x0) extra calls per iteration; ~40 iterations is typical
+    esperadas = 40 * (len(x0) + 1)
+    evaluaciones = [0]
+
+    def residuos(x):
+        evaluaciones[0] += 1
+        if progreso is not None:
+            progreso(min(evaluaciones[0] / esperadas, 0.99), f"evaluación {evaluaciones[0]}")
+        return (curva(modelo, dict(zip(nombres, np.exp(x))), n) - datos) / escala
+
+    res = least_squares(residuos, x0, bounds=(bajo, alto), max_nfev=max_evaluaciones)
+    params = {p: float(v) for p, v in zip(nombres, np.exp(res.x))}
+    return {"params": params, "rmse": float(np.sqrt(np.mean(res.fun ** 2)) * escala),
+            "evaluaciones": evaluaciones[0], "exito": bool(res.success)}
+
+
+def revisar(params, acumulados):
+    """Warning for a fit that is numerically fine but not meaningful, or None"""
+    observados = float(acumulados[-1] - acumulados[0])
+    if params["N"] < observados * 1.01:
+        return "la población efectiva quedó en su mínimo (los casos observados): la curva aún no muestra saturación"
+    if params["I0"] < 1.5:
+        return "I₀ quedó en su mínimo: el ajuste no identifica el inicio del brote"
+    return None
+
+
+def ajustar_pais(modelo, pais, dias, fechas, acumulados, poblacion, progreso=None):
+    """ajustar() cached per model, country, window and last data date, warm-started from the country's last fit"""
+    clave = f"{modelo}|{pais}|{dias}|{fechas[-1]}"
+    ajustes = _leer()
+    if clave in ajustes:
+        return {"params": ajustes[clave], "cache": True, "aviso": revisar(ajustes[clave], acumulados)}
+    res = ajustar(modelo, acumulados, poblacion, inicio=ajustes.get(f"{modelo}|{pais}"), progreso=progreso)
+    _guardar(clave, res["params"], modelo, pais)
+    return dict(res, cache=False, aviso=revisar(res["params"], acumulados))
@@ -0,0 +1,35 @@
+import numpy as np
+
+from utils.compartimentos import SIR
+from utils.sir_analitico import resumen_sir
+
+
+def calcular_barrido_sir(beta_min, beta_max, n_beta, gamma_min, gamma_max, n_gamma, N, I0, T=160.0, h=0.25,
+                         progreso=None):
+    """Peak infected, time to peak and final size over a beta x gamma grid.
+
+    Peak and final size come from the closed forms; only the day of the peak
+    needs the stacked RK4 integration. `progreso(fraccion, mensaje)` is called
+    as the integration advances.
+    """
+    betas = np.linspace(beta_min, beta_max, n_beta)
+    gammas = np.linspace(gamma_min, gamma_max, n_gamma)
+    B, G = np.meshgrid(betas, gammas, indexing="ij")
+
+    y = np.empty((3,) + B.shape)
+    y[0], y[1], y[2] = N - I0, I0, 0.0
+    pico = y[1].copy()
+    t_pico = np.zeros(B.shape)
+
+    pasos = int(round(T / h))
+    for k in range(1, pasos + 1):
+        y = SIR.paso_rk4(y, h, N, beta=B, gamma=G)
+        if progreso is not None:
+            progreso(k / pasos, f"día {k * h:.0f} de {T:.0f}")
+        mayor = y[1] > pico
+        pico[mayor] = y[1][mayor]
+        t_pico[mayor] = k * h
+
+    resumen = resumen_sir(B, G, N, I0)
+    return {"betas": betas, "gammas": gammas, "pico": resumen["pico"],
+            "t_pico": t_pico, "final": resumen["final"]}
@@ -0,0 +1,84 @@
+import base64
+import os
+
+import numpy as np
+
+ACTIVO = os.environ.get("DASH_TM_BINARIO", "1") != "0"
+MIN_ELEMENTOS = 64
+
+_ENTEROS = [np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32]
+_CODIGOS = {np.dtype(t): np.dtype(t).str[1:] for t in _ENTEROS + [np.float32, np.float64]}
+
+
+def _tipo(arr, flotante):
+    if np.issubdtype(arr.dtype, np.bool_):
+        return np.dtype(np.uint8)
+    if np.issubdtype(arr.dtype, np.integer):
+        bajo, alto = (arr.min(), arr.max()) if arr.size else (0, 0)
+        for t in _ENTEROS:
+            info = np.iinfo(t)
+            if info.min <= bajo and alto <= info.max:
+                return np.dtype(t)
+        return np.dtype(np.float64)
+    return np.dtype(flotante)
+
+
+def codificar(valores, flotante=np.float32):
+    """plotly.js typed-array spec {dtype, bdata[, shape]}: floats as float32 by default, ints in the narrowest type.
+
+    datetime64 values become float64 milliseconds since the epoch, which plotly.js
+    reads as dates only on axes declared with type="date".
+    """
+    arr = np.asarray(valores)
+    if arr.dtype.kind == "M":
+        arr, flotante = arr.astype("datetime64[ms]").astype(np.int64).astype(np.float64), np.float64
+    tipo = _tipo(arr, flotante)
+    arr = np.ascontiguousarray(arr, dtype=tipo.newbyteorder("<"))
+    spec = {"dtype": _CODIGOS[tipo], "bdata": base64.b64encode(arr.tobytes()).decode("ascii")}
+    if arr.ndim > 1:
+        spec["shape"] = ", ".join(map(str, arr.shape))
+    return spec
+
+
+def _numerico(valor):
+    if isinstance(valor, np.ndarray):
+        return valor.dtype.kind in "biufM" and valor.size >= MIN_ELEMENTOS
+    return (isinstance(valor, (list, tuple)) and len(valor) >= MIN_ELEMENTOS
+            and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in valor))
+
+
+def _decodificar(spec):
+    arr = np.frombuffer(base64.b64decode(spec["bdata"]), dtype=np.dtype(spec["dtype"]).newbyteorder("<"))
+    if "shape" in spec:
+        arr = arr.reshape([int(n) for n in spec["shape"].split(",")])
+    return arr
+
+
+def arreglo(valores, flotante=np.float32):
+    """Typed array for one trace attribute, or the values untouched when the serializer is off or they are small"""
+    if not ACTIVO or not _numerico(valores):
+        return valores
+    return codificar(valores, flotante)
+
+
+def binarizar(figura, flotante=np.float32):
+    """Figure (go.Figure or dict) as a dict whose large numeric arrays are base64 typed arrays"""
+    if hasattr(figura, "to_plotly_json"):
+        figura = figura.to_plotly_json()
+    if not ACTIVO:
+        return figura
+
+    def recorrer(valor):
+        if isinstance(valor, dict):
+            # plotly.py already emits typed arrays for NumPy data, but always at full width
+            if "bdata" in valor and "dtype" in valor:
+                return codificar(_decodificar(valor), flotante)
+            return {k: recorrer(v) for k, v in valor.items()}
+        if _numerico(valor):
+            return codificar(valor, flotante)
+        if isinstance(valor, (list, tuple)):
+            return [recorrer(v) for v in valor]
+        return valor
+
+    return {"data": recorrer(figura.get("data", [])), "layout": figura.get("layout", {}),
+            **{k: v for k, v in figura.items() if k not in ("data", "layout")}}
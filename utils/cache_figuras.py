@@ -0,0 +1,57 @@
+import functools
+import glob
+import hashlib
+import json
+import os
+
+import plotly
+from plotly.io.json import to_json_plotly
+
+from utils.referencia import CACHE_DIR
+
+FIGURAS_DIR = os.path.join(CACHE_DIR, "figuras")
+
+
+def clave_fuentes(fuentes):
+    """Hash of the given source files plus the plotly version"""
+    h = hashlib.sha256(plotly.__version__.encode())
+    for fuente in fuentes:
+        with open(fuente, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def figura_cacheada(nombre, fuentes, construir):
+    """Load a static figure as JSON from disk, rebuilding it when its sources change"""
+    path = os.path.join(FIGURAS_DIR, f"{nombre}-{clave_fuentes(fuentes)}.json")
+    try:
+        with open(path, "rb") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        pass
+
+    texto = to_json_plotly(construir())
+    try:
+        os.makedirs(FIGURAS_DIR, exist_ok=True)
+        for viejo in glob.glob(os.path.join(FIGURAS_DIR, f"{nombre}-*.json")):
+            if viejo != path:
+                os.remove(viejo)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(texto)
+        os.replace(tmp, path)
+    except OSError as e:
+        print("No se pudo guardar la figura en caché:", e)
+    return json.loads(texto)
+
+
+def figura_perezosa(construir):
+    """Zero-argument function returning construir()'s figure, built on its first call and then reused.
+
+    For a page's default figure: the page module imports without solving
+    anything and the first `layout()` call pays for it once.
+    """
+    @functools.lru_cache(maxsize=1)
+    def figura():
+        return construir()
+    return figura
@@ -0,0 +1,65 @@
+import numpy as np
+from plotly.colors import sample_colorscale
+
+
+def segmentos(x0, y0, x1, y1):
+    """Interleave segment endpoints with NaN gaps so every segment fits in one trace"""
+    x0, y0, x1, y1 = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (x0, y0, x1, y1)))
+    x = np.column_stack([x0.ravel(), x1.ravel(), np.full(x0.size, np.nan)])
+    y = np.column_stack([y0.ravel(), y1.ravel(), np.full(y0.size, np.nan)])
+    return x.ravel(), y.ravel()
+
+
+def campo_direcciones(X, Y, DX, DY, color="rgba(0, 82, 147, 0.7)", ancho=1.5, punta=7):
+    """Direction field as a single scatter trace of centered segments with arrowhead markers"""
+    X, Y, DX, DY = np.broadcast_arrays(X, Y, DX, DY)
+    x, y = segmentos(X - DX / 2, Y - DY / 2, X + DX / 2, Y + DY / 2)
+    return dict(
+        type="scatter", x=x, y=y, mode="lines+markers",
+        line=dict(color=color, width=ancho),
+        marker=dict(symbol="arrow", angleref="previous", color=color,
+                    size=np.tile([0, punta, 0], X.size)),
+        hoverinfo="skip", showlegend=False
+    )
+
+
+def quiver(X, Y, U, V, longitud, colorscale="Viridis", niveles=8, punta=7):
+    """Quiver as a fixed set of traces: segments binned by magnitude, one head trace with colorbar and hover data"""
+    X, Y, U, V = (np.asarray(a, dtype=float).ravel() for a in np.broadcast_arrays(X, Y, U, V))
+    mag = np.hypot(U, V)
+    ok = np.isfinite(mag) & (mag > 0)
+    X, Y, U, V, mag = X[ok], Y[ok], U[ok], V[ok], mag[ok]
+    if not mag.size:
+        return []
+
+    escala = longitud / mag.max()
+    X1, Y1 = X + U * escala, Y + V * escala
+
+    mag_min, mag_max = mag.min(), mag.max()
+    rel = (mag - mag_min) / (mag_max - mag_min + 1e-12)
+    nivel = np.minimum((rel * niveles).astype(int), niveles - 1)
+    centros = (np.arange(niveles) + 0.5) / niveles
+    colores = sample_colorscale(colorscale, list(centros))
+
+    trazas = []
+    for k in range(niveles):
+        sel = nivel == k
+        if not sel.any():
+            continue
+        x, y = segmentos(X[sel], Y[sel], X1[sel], Y1[sel])
+        trazas.append(dict(type="scatter", x=x, y=y, mode="lines",
+                           line=dict(width=2, color=colores[k]),
+                           hoverinfo="skip", showlegend=False))
+
+    trazas.append(dict(
+        type="scatter", x=X1, y=Y1, mode="markers",
+        marker=dict(symbol="arrow", size=punta, angle=np.degrees(np.arctan2(U, V)),
+                    color=mag, colorscale=colorscale, cmin=mag_min, cmax=mag_max,
+                    colorbar=dict(title="Magnitud"), showscale=True),
+        customdata=np.column_stack([X, Y, U, V, mag]),
+        hovertemplate="Punto: (%{customdata[0]:.1f}, %{customdata[1]:.1f})"
+                      "<br>Vector: (%{customdata[2]:.2f}, %{customdata[3]:.2f})"
+                      "<br>Magnitud: %{customdata[4]:.2f}<extra></extra>",
+        showlegend=False
+    ))
+    return trazas
@@ -0,0 +1,93 @@
+from collections import namedtuple
+
+import numpy as np
+from scipy.integrate import odeint
+
+Flujo = namedtuple("Flujo", "origen destino tasa contacto", defaults=(None,))
+Flujo.__doc__ = """Flow origen -> destino at rate tasa*origen, times contacto/N for mass-action flows"""
+
+
+class ModeloCompartimental:
+    """Compartment graph turned into a scalar RHS for odeint and a stacked NumPy RHS for batches"""
+
+    def __init__(self, compartimentos, flujos):
+        self.compartimentos = list(compartimentos)
+        self.flujos = list(flujos)
+        self.parametros = list(dict.fromkeys(f.tasa for f in self.flujos))
+        self.descripcion = repr((self.compartimentos, [tuple(f) for f in self.flujos]))
+        self.rhs = self._construir_rhs()
+        self.rhs_escalar = self._construir_rhs_escalar()
+
+    def _construir_rhs(self):
+        indice = {c: i for i, c in enumerate(self.compartimentos)}
+        origen = np.array([indice[f.origen] for f in self.flujos])
+        masivos = np.array([k for k, f in enumerate(self.flujos) if f.contacto])
+        contacto = np.array([indice[self.flujos[k].contacto] for k in masivos], dtype=int)
+        # Stoichiometry: column k takes flow k out of its origin and into its destination
+        balance = np.zeros((len(self.compartimentos), len(self.flujos)))
+        for k, f in enumerate(self.flujos):
+            balance[indice[f.origen], k] -= 1.0
+            balance[indice[f.destino], k] += 1.0
+
+        def rhs(y, t, N, tasas):
+            y = np.asarray(y, dtype=float)
+            flujo = tasas * y[origen]
+            if len(masivos):
+                flujo[masivos] *= y[contacto] / N
+            return balance @ flujo if flujo.ndim == 1 else np.tensordot(balance, flujo, axes=1)
+
+        return rhs
+
+    def _construir_rhs_escalar(self):
+        """odeint calls the RHS hundreds of times on a 1-D state; plain floats beat NumPy dispatch there"""
+        indice = {c: i for i, c in enumerate(self.compartimentos)}
+        flujos = [(indice[f.origen], indice[f.destino], indice[f.contacto] if f.contacto else None)
+                  for f in self.flujos]
+        n = len(self.compartimentos)
+
+        def rhs_escalar(y, t, N, tasas):
+            y = y.tolist()
+            dy = [0.0] * n
+            for (origen, destino, contacto), tasa in zip(flujos, tasas):
+                flujo = tasa * y[origen]
+                if contacto is not None:
+                    flujo *= y[contacto] / N
+                dy[origen] -= flujo
+                dy[destino] += flujo
+            return dy
+
+        return rhs_escalar
+
+    def argumentos(self, N, params):
+        """(N, tasas) for rhs; tasas holds each flow's rate, stacked so parameters may be arrays for batched scenarios"""
+        return N, np.stack(np.broadcast_arrays(*(np.asarray(params[f.tasa], dtype=float) for f in self.flujos)))
+
+    def derivadas(self, y, N, **params):
+        """dy/dt as an array; y may carry trailing axes and params may be arrays for batched scenarios"""
+        return self.rhs(y, 0.0, *self.argumentos(N, params))
+
+    def paso_rk4(self, y, h, N, **params):
+        """One classic RK4 step over a (possibly stacked) state array"""
+        args = self.argumentos(N, params)
+        k1 = self.rhs(y, 0.0, *args)
+        k2 = self.rhs(y + h / 2 * k1, 0.0, *args)
+        k3 = self.rhs(y + h / 2 * k2, 0.0, *args)
+        k4 = self.rhs(y + h * k3, 0.0, *args)
+        return y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+    def resolver(self, y0, t, N, **params):
+        """Integrate with odeint on the scalar RHS; returns one row per compartment"""
+        tasas = tuple(float(params[f.tasa]) for f in self.flujos)
+        return odeint(self.rhs_escalar, y0, t, args=(float(N), tasas)).T
+
+
+SIR = ModeloCompartimental(["S", "I", "R"], [
+    Flujo("S", "I", "beta", contacto="I"),
+    Flujo("I", "R", "gamma")
+])
+
+SEIR = ModeloCompartimental(["S", "E", "I", "R"], [
+    Flujo("S", "E", "beta", contacto="I"),
+    Flujo("E", "I", "sigma"),
+    Flujo("I", "R", "gamma")
+])
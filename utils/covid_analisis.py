@@ -0,0 +1,72 @@
+import numpy as np
+
+from utils.memo import CacheMemoria
+
+CAMPOS = ["cases", "deaths", "recovered"]
+# Mean generation interval (days) used to turn growth rates into Rt
+INTERVALO_GENERACION = 5.0
+
+_cache = CacheMemoria(16 * 2**20)
+
+
+def parsear_fechas(claves):
+    """disease.sh 'm/d/yy' keys to datetime64[D] with vectorized string ops, no per-date strptime"""
+    a = np.asarray(list(claves), dtype=str)
+    mes, _, resto = np.char.partition(a, "/").T
+    dia, _, anio = np.char.partition(resto, "/").T
+    iso = np.char.add(np.char.add(np.char.add("20", anio), "-"),
+                      np.char.add(np.char.add(np.char.zfill(mes, 2), "-"), np.char.zfill(dia, 2)))
+    return iso.astype("datetime64[D]")
+
+
+def serie(timeline):
+    """One pass over a timeline dict: (fechas, {campo: int64 array}) for the fields present.
+
+    Fields of different lengths are cut to the most recent days they all
+    share, since every window ends on the same upstream date.
+    """
+    presentes = [c for c in CAMPOS if timeline.get(c)]
+    if "cases" not in presentes:
+        return np.array([], dtype="datetime64[D]"), {}
+    n = min(len(timeline[c]) for c in presentes)
+    fechas = parsear_fechas(list(timeline["cases"].keys())[-n:])
+    return fechas, {c: np.fromiter(timeline[c].values(), dtype=np.int64, count=len(timeline[c]))[-n:]
+                    for c in presentes}
+
+
+def media_movil(x, n):
+    """Trailing n-day mean; the first n-1 days average what is available"""
+    acumulado = np.cumsum(np.insert(np.asarray(x, dtype=float), 0, 0.0))
+    k = np.arange(1, len(x) + 1)
+    return (acumulado[k] - acumulado[np.maximum(k - n, 0)]) / np.minimum(k, n)
+
+
+def indicadores(acumulados, tg=INTERVALO_GENERACION):
+    """Daily counts, 7/14-day means, growth rate, doubling time and Rt from a cumulative series"""
+    acumulados = np.asarray(acumulados, dtype=float)
+    # Upstream back-corrections show up as negative days; they are not new cases
+    nuevos = np.clip(np.diff(acumulados, prepend=acumulados[:1]), 0, None)
+    media7 = media_movil(nuevos, 7)
+    media14 = media_movil(nuevos, 14)
+
+    # Exponential growth rate from week-over-week change of the 7-day mean
+    anterior = np.concatenate([np.full(7, np.nan), media7[:-7]])[:len(media7)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crecimiento = np.log(media7 / anterior) / 7
+        crecimiento[~np.isfinite(crecimiento)] = np.nan
+        duplicacion = np.where(crecimiento > 0, np.log(2) / crecimiento, np.inf)
+        duplicacion[np.isnan(crecimiento)] = np.nan
+    # Wallinga-Lipsitch with an exponential generation interval: R = 1 + r*Tg
+    rt = np.clip(1 + crecimiento * tg, 0, None)
+    return {"nuevos": nuevos, "media7": media7, "media14": media14,
+            "crecimiento": crecimiento, "duplicacion": duplicacion, "rt": rt}
+
+
+def analizar(pais, dias, fechas, acumulados):
+    """indicadores() cached per country, window and last data date"""
+    clave = (pais, dias, str(fechas[-1]) if len(fechas) else None)
+    res = _cache.obtener(clave)
+    if res is None:
+        res = indicadores(acumulados)
+        _cache.guardar(clave, res, sum(v.nbytes for v in res.values()))
+    return res
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.referencia import CACHE_DIR
+
+BASE = "https://disease.sh/v3/covid-19"
+HTTP_DIR = os.path.join(CACHE_DIR, "http")
+
+# Seconds a response is served without asking upstream, per endpoint
+TTL = {"paises": 3600, "actual": 600, "historico": 6 * 3600}
+
+
+class Entrada:
+    """One cached response with the validators needed to revalidate it"""
+
+    __slots__ = ("datos", "etag", "modificado", "guardado")
+
+    def __init__(self, datos, etag=None, modificado=None, guardado=None):
+        self.datos = datos
+        self.etag = etag
+        self.modificado = modificado
+        self.guardado = guardado if guardado is not None else time.time()
+
+    def edad(self):
+        return time.time() - self.guardado
+
+
+class ClienteCovid:
+    """disease.sh client over a pooled session with memory and disk caches.
+
+    Fresh entries (younger than the endpoint TTL) are answered locally. Stale
+    entries are answered locally too while a background conditional request
+    (If-None-Match / If-Modified-Since) refreshes them; only a cold miss waits
+    on the network. Network errors propagate from cold misses only.
+    """
+
+    def __init__(self, base=BASE, ttl=TTL, directorio=HTTP_DIR, max_memoria=256, pool=8):
+        self.base = base
+        self.ttl = dict(ttl)
+        self.directorio = directorio
+        self.max_memoria = max_memoria
+        self.sesion = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=2, pool_maxsize=pool)
+        self.sesion.mount("https://", adaptador)
+        self.sesion.mount("http://", adaptador)
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self._revalidando = set()
+        self._fondo = ThreadPoolExecutor(max_workers=2, thread_name_prefix="covid-revalidar")
+
+    def _clave(self, ruta, params):
+        return f"{ruta}?{urlencode(sorted((params or {}).items()))}"
+
+    def _archivo(self, clave):
+        return os.path.join(self.directorio, hashlib.sha1(clave.encode()).hexdigest() + ".json")
+
+    def _leer(self, clave):
+        with self._lock:
+            entrada = self._memoria.get(clave)
+            if entrada is not None:
+                self._memoria.move_to_end(clave)
+                return entrada
+        try:
+            with open(self._archivo(clave), encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entrada = Entrada(d["datos"], d.get("etag"), d.get("modificado"), d.get("guardado"))
+        self._recordar(clave, entrada)
+        return entrada
+
+    def _recordar(self, clave, entrada):
+        with self._lock:
+            self._memoria[clave] = entrada
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.max_memoria:
+                self._memoria.popitem(last=False)
+
+    def _guardar(self, clave, entrada):
+        self._recordar(clave, entrada)
+        os.makedirs(self.directorio, exist_ok=True)
+        path = self._archivo(clave)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"clave": clave, "datos": entrada.datos, "etag": entrada.etag,
+                       "modificado": entrada.modificado, "guardado": entrada.guardado}, f)
+        os.replace(tmp, path)
+
+    def _pedir(self, clave, ruta, params, entrada, timeout):
+        if os.environ.get("DASH_TM_SIN_RED"):
+            raise requests.ConnectionError("red desactivada con DASH_TM_SIN_RED")
+        cabeceras = {}
+        if entrada is not None and entrada.etag:
+            cabeceras["If-None-Match"] = entrada.etag
+        if entrada is not None and entrada.modificado:
+            cabeceras["If-Modified-Since"] = entrada.modificado
+
+        r = self.sesion.get(f"{self.base}/{ruta}", params=params, headers=cabeceras, timeout=timeout)
+        if r.status_code == 304 and entrada is not None:
+            nueva = Entrada(entrada.datos, r.headers.get("ETag", entrada.etag),
+                            r.headers.get("Last-Modified", entrada.modificado))
+        else:
+            r.raise_for_status()
+            nueva = Entrada(r.json(), r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        self._guardar(clave, nueva)
+        return nueva
+
+    def _revalidar(self, clave, ruta, params, entrada, timeout):
+        try:
+            self._pedir(clave, ruta, params, entrada, timeout)
+        except (requests.RequestException, ValueError) as e:
+            print("No se pudo revalidar", clave, "-", e)
+        finally:
+            with self._lock:
+                self._revalidando.discard(clave)
+
+    def obtener(self, endpoint, ruta, params=None, timeout=10):
+        """Parsed JSON for base/ruta, from cache when possible; raises requests errors on a cold miss"""
+        clave = self._clave(ruta, params)
+        entrada = self._leer(clave)
+        if entrada is None:
+            return self._pedir(clave, ruta, params, None, timeout).datos
+
+        if entrada.edad() > self.ttl[endpoint] and not os.environ.get("DASH_TM_SIN_RED"):
+            with self._lock:
+                nueva = clave not in self._revalidando
+                self._revalidando.add(clave)
+            if nueva:
+                self._fondo.submit(self._revalidar, clave, ruta, params, entrada, timeout)
+        return entrada.datos
+
+    def paises(self, timeout=10):
+        return self.obtener("paises", "countries", timeout=timeout)
+
+    def actual(self, pais, timeout=10):
+        return self.obtener("actual", f"countries/{pais}", timeout=timeout)
+
+    def historico(self, pais, dias, timeout=10):
+        return self.obtener("historico", f"historical/{pais}", {"lastdays": dias}, timeout=timeout)
+
+
+cliente = ClienteCovid()
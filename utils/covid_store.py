@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from utils.covid_api import cliente
+from utils.referencia import CACHE_DIR
+
+STORE_DIR = os.path.join(CACHE_DIR, "covid")
+INDICE = os.path.join(STORE_DIR, "indice.json")
+CAMPOS = ["cases", "deaths", "recovered"]
+# A store last synced longer ago than this is still served, but triggers a background sync
+VIGENCIA = float(os.environ.get("DASH_TM_COVID_VIGENCIA", 24 * 3600))
+
+# /countries names that the JHU-based historical endpoint spells differently
+ALIAS = {"USA": "US", "UK": "United Kingdom", "S. Korea": "Korea, South", "Taiwan": "Taiwan*",
+         "UAE": "United Arab Emirates", "Czechia": "Czech Republic"}
+
+_abierto = {"mtime": None, "indice": None, "campos": None}
+_sincronizacion = {"hilo": None, "lock": threading.Lock()}
+
+
+def _leer_indice():
+    with open(INDICE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _abrir():
+    """Index plus one read-only memmap per field, reopened when a sync replaced the files"""
+    try:
+        mtime = os.path.getmtime(INDICE)
+    except OSError:
+        return None, None
+    if _abierto["mtime"] != mtime:
+        try:
+            indice = _leer_indice()
+            campos = {c: np.load(os.path.join(STORE_DIR, f"{c}.npy"), mmap_mode="r") for c in CAMPOS}
+        except (OSError, ValueError, KeyError):
+            return None, None
+        indice["filas"] = {p: i for i, p in enumerate(indice["paises"])}
+        _abierto.update(mtime=mtime, indice=indice, campos=campos)
+    return _abierto["indice"], _abierto["campos"]
+
+
+def fechas(indice):
+    return np.datetime64(indice["inicio"]) + np.arange(indice["dias"])
+
+
+def vigente(indice):
+    return time.time() - indice.get("sincronizado", 0) < VIGENCIA
+
+
+def historico(pais, dias="all"):
+    """(fechas, {campo: array}) for the last `dias` days of one country, as memmap slices.
+
+    None if the country is not stored. A stale store is still served and
+    starts an incremental sync in the background.
+    """
+    indice, campos = _abrir()
+    if indice is None:
+        return None
+    if not vigente(indice):
+        sincronizar_en_segundo_plano()
+    fila = indice["filas"].get(pais, indice["filas"].get(ALIAS.get(pais)))
+    if fila is None:
+        return None
+    desde = 0 if dias == "all" else max(indice["dias"] - int(dias), 0)
+    return fechas(indice)[desde:], {c: campos[c][fila, desde:] for c in CAMPOS}
+
+
+def _descargar(lastdays, timeout=120):
+    r = cliente.sesion.get(f"{cliente.base}/historical", params={"lastdays": lastdays}, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
+
+
+def _ultimo_remoto(timeout=30):
+    """Latest day upstream has, from the tiny global-totals series"""
+    r = cliente.sesion.get(f"{cliente.base}/historical/all", params={"lastdays": 1}, timeout=timeout)
+    r.raise_for_status()
+    clave = next(iter(r.json()["cases"]))
+    return np.datetime64(datetime.strptime(clave, "%m/%d/%y").date(), "D")
+
+
+def _agregar(respuesta):
+    """Bulk response (one entry per country or province) summed per country into (paises, fechas, {campo: matrix})"""
+    primero = next(e["timeline"] for e in respuesta if e.get("timeline"))
+    claves = list(primero["cases"])
+    dias = np.array([datetime.strptime(k, "%m/%d/%y") for k in claves], dtype="datetime64[D]")
+
+    paises = sorted({e["country"] for e in respuesta})
+    filas = {p: i for i, p in enumerate(paises)}
+    datos = {c: np.zeros((len(paises), len(claves)), dtype=np.int64) for c in CAMPOS}
+    for e in respuesta:
+        for c in CAMPOS:
+            serie = e["timeline"].get(c) or {}
+            datos[c][filas[e["country"]]] += np.array([serie.get(k) or 0 for k in claves], dtype=np.int64)
+    return paises, dias, datos
+
+
+def _escribir(indice, datos):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    for c in CAMPOS:
+        path = os.path.join(STORE_DIR, f"{c}.npy")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, datos[c].astype(np.int64))
+        os.replace(tmp, path)
+    tmp = f"{INDICE}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False)
+    os.replace(tmp, INDICE)
+
+
+def sincronizar(completo=False):
+    """Fetch the days added since the last sync (or everything) and merge them into the store"""
+    indice, viejos = (None, None) if completo else _abrir()
+    if indice is None and not completo and os.path.exists(INDICE):
+        # Merging into an unreadable store would drop its history; rebuild it instead
+        print("Almacén Covid ilegible; se descarga el histórico completo")
+
+    if indice is None:
+        lastdays = "all"
+    else:
+        ultimo = fechas(indice)[-1]
+        # One day of overlap picks up upstream corrections to the last stored day
+        lastdays = max(int((_ultimo_remoto() - ultimo).astype(int)), 0) + 1
+
+    paises, dias, nuevos = _agregar(_descargar(lastdays))
+    if indice is None:
+        inicio, total, anteriores = dias[0], len(dias), []
+    else:
+        anteriores = indice["paises"]
+        inicio = min(np.datetime64(indice["inicio"]), dias[0])
+        total = int((max(fechas(indice)[-1], dias[-1]) - inicio).astype(int)) + 1
+
+    todos = sorted(set(anteriores) | set(paises))
+    datos = {c: np.zeros((len(todos), total), dtype=np.int64) for c in CAMPOS}
+    filas = {p: i for i, p in enumerate(todos)}
+    desde = int((dias[0] - inicio).astype(int))
+    if viejos is not None:
+        ya = [filas[p] for p in anteriores]
+        antes = int((np.datetime64(indice["inicio"]) - inicio).astype(int))
+        fin = antes + indice["dias"]
+        # Countries absent from this response keep their last cumulative value on the new days
+        presentes = set(paises)
+        faltan = [filas[p] for p in anteriores if p not in presentes]
+        for c in CAMPOS:
+            datos[c][ya, antes:fin] = viejos[c]
+            datos[c][faltan, fin:] = datos[c][faltan, fin - 1:fin]
+    nuevas = [filas[p] for p in paises]
+    for c in CAMPOS:
+        datos[c][nuevas, desde:desde + len(dias)] = nuevos[c]
+
+    indice = {"inicio": str(inicio), "dias": total, "paises": todos, "campos": CAMPOS,
+              "sincronizado": time.time()}
+    _escribir(indice, datos)
+    return {"paises": len(todos), "dias": total, "descargados": len(dias), "ultimo": str(inicio + total - 1)}
+
+
+def sincronizar_en_segundo_plano():
+    """Incremental sync on a daemon thread, at most one at a time per process"""
+    if os.environ.get("DASH_TM_SIN_RED"):
+        return
+
+    def correr():
+        try:
+            sincronizar()
+        except Exception as e:
+            print("No se pudo sincronizar el almacén Covid:", e)
+
+    with _sincronizacion["lock"]:
+        hilo = _sincronizacion["hilo"]
+        if hilo is not None and hilo.is_alive():
+            return
+        hilo = _sincronizacion["hilo"] = threading.Thread(target=correr, name="covid-sync", daemon=True)
+        hilo.start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sincroniza el almacén local de series históricas de Covid-19")
+    parser.add_argument("--completo", action="store_true", help="descarga todo el histórico en lugar de los días nuevos")
+    args = parser.parse_args(argv)
+    t0 = time.perf_counter()
+    resumen = sincronizar(args.completo)
+    print(f"{resumen['paises']} países × {resumen['dias']} días hasta {resumen['ultimo']} "
+          f"({resumen['descargados']} días descargados) en {time.perf_counter() - t0:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import ast
+from functools import lru_cache
+
+import numpy as np
+
+FUNCIONES = {nombre: getattr(np, nombre) for nombre in [
+    "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2",
+    "sinh", "cosh", "tanh", "exp", "log", "log10", "log2", "sqrt",
+    "abs", "sign", "floor", "ceil", "minimum", "maximum", "hypot"
+]}
+CONSTANTES = {"pi": np.pi, "e": np.e}
+VARIABLES = ("X", "Y")
+
+NODOS = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Constant,
+         ast.Attribute, ast.Load, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow,
+         ast.Mod, ast.FloorDiv, ast.USub, ast.UAdd)
+
+
+class ErrorExpresion(ValueError):
+    """Invalid user expression, with the offending column when known"""
+
+    def __init__(self, mensaje, expresion, columna=None):
+        super().__init__(mensaje)
+        self.mensaje = mensaje
+        self.expresion = expresion
+        self.columna = columna
+
+    def __str__(self):
+        if self.columna is None:
+            return self.mensaje
+        return f"{self.mensaje} (columna {self.columna + 1}: «{self.expresion[self.columna:self.columna + 10]}»)"
+
+    def como_dict(self):
+        return {"mensaje": self.mensaje, "expresion": self.expresion, "columna": self.columna}
+
+
+class _Validador(ast.NodeTransformer):
+    def __init__(self, expresion):
+        self.expresion = expresion
+
+    def error(self, mensaje, nodo):
+        raise ErrorExpresion(mensaje, self.expresion, getattr(nodo, "col_offset", None))
+
+    def generic_visit(self, nodo):
+        if not isinstance(nodo, NODOS):
+            self.error(f"Construcción no permitida: {type(nodo).__name__}", nodo)
+        return super().generic_visit(nodo)
+
+    def visit_Attribute(self, nodo):
+        if not (isinstance(nodo.value, ast.Name) and nodo.value.id == "np"):
+            self.error("Solo se permiten atributos de np", nodo)
+        if nodo.attr not in FUNCIONES and nodo.attr not in CONSTANTES:
+            self.error(f"Función no permitida: np.{nodo.attr}", nodo)
+        return ast.copy_location(ast.Name(id=nodo.attr, ctx=ast.Load()), nodo)
+
+    def visit_Name(self, nodo):
+        if nodo.id not in VARIABLES and nodo.id not in FUNCIONES and nodo.id not in CONSTANTES:
+            self.error(f"Nombre desconocido: {nodo.id}", nodo)
+        return nodo
+
+    def visit_Call(self, nodo):
+        if nodo.keywords:
+            self.error("No se permiten argumentos con nombre", nodo)
+        nodo = self.generic_visit(nodo)
+        if not (isinstance(nodo.func, ast.Name) and nodo.func.id in FUNCIONES):
+            self.error("Solo se pueden llamar funciones de NumPy permitidas", nodo)
+        return nodo
+
+    def visit_Constant(self, nodo):
+        if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float)):
+            self.error("Solo se permiten constantes numéricas", nodo)
+        # Floats make huge powers overflow instead of building giant integers
+        return ast.copy_location(ast.Constant(value=float(nodo.value)), nodo)
+
+
+# Tabs and newlines become spaces one-for-one, so error columns still match the user's text
+_ESPACIOS = str.maketrans("\t\r\n", "   ")
+
+
+def _columna(texto, desplazamiento):
+    """AST offsets count UTF-8 bytes; turn one into a character column"""
+    return len(texto.encode("utf-8")[:desplazamiento].decode("utf-8", errors="ignore"))
+
+
+def _analizar(texto):
+    """Parse and whitelist-check a stripped expression; error columns are characters into it"""
+    try:
+        arbol = ast.parse(texto, mode="eval")
+    except SyntaxError as e:
+        raise ErrorExpresion(f"Sintaxis inválida: {e.msg}", texto, e.offset - 1 if e.offset else None) from None
+    try:
+        return ast.fix_missing_locations(_Validador(texto).visit(arbol))
+    except ErrorExpresion as e:
+        if e.columna is not None:
+            e.columna = _columna(texto, e.columna)
+        raise
+
+
+@lru_cache(maxsize=256)
+def _compilar(texto):
+    codigo = compile(_analizar(texto), "<expresion>", "eval")
+    entorno = {"__builtins__": {}, **FUNCIONES, **CONSTANTES}
+
+    def evaluar(X, Y):
+        try:
+            with np.errstate(all="ignore"):
+                res = np.asarray(eval(codigo, entorno, {"X": X, "Y": Y}))
+        except (ArithmeticError, TypeError, ValueError) as e:
+            raise ErrorExpresion(f"No se pudo evaluar: {e}", texto) from None
+        if res.dtype.kind not in "biuf":
+            raise ErrorExpresion("La expresión no da un valor numérico real", texto)
+        return np.broadcast_to(res.astype(float), np.broadcast(X, Y).shape).copy()
+
+    return evaluar
+
+
+def compilar(expresion):
+    """Parse, whitelist-check and compile an expression in X and Y into a vectorized callable.
+
+    Cached on the expression with tabs/newlines as spaces and the ends
+    stripped; errors are re-pointed at the text exactly as typed.
+    """
+    if not isinstance(expresion, str) or not expresion.strip():
+        raise ErrorExpresion("La expresión está vacía", expresion or "")
+    texto = expresion.translate(_ESPACIOS)
+    sangria = len(texto) - len(texto.lstrip())
+    try:
+        return _compilar(texto.strip())
+    except ErrorExpresion as e:
+        if e.columna is not None:
+            e.columna += sangria
+        e.expresion = expresion
+        raise
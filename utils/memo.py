@@ -0,0 +1,191 @@
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utils.referencia import CACHE_DIR
+
+MAX_BYTES = int(os.environ.get("DASH_TM_MEMO_BYTES", 64 * 2**20))
+BACKEND = os.environ.get("DASH_TM_MEMO_BACKEND", "disco")
+MEMO_DB = os.path.join(CACHE_DIR, "memo.sqlite")
+
+_memos = {}
+
+
+def normalizar(valor):
+    """Canonical hashable form of callback inputs: floats rounded, containers as tuples"""
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, (int, float)):
+        valor = float(valor)
+        return int(valor) if valor.is_integer() else round(valor, 9)
+    if isinstance(valor, dict):
+        return tuple(sorted((k, normalizar(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple)):
+        return tuple(normalizar(v) for v in valor)
+    return repr(valor)
+
+
+class CacheMemoria:
+    """Per-process LRU bounded by the pickled size of its entries"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave):
+        with self._lock:
+            if clave not in self._datos:
+                return None
+            self._datos.move_to_end(clave)
+            return self._datos[clave][0]
+
+    def guardar(self, clave, valor, tam):
+        if tam > self.max_bytes:
+            return
+        with self._lock:
+            if clave in self._datos:
+                self.bytes -= self._datos.pop(clave)[1]
+            self._datos[clave] = (valor, tam)
+            self.bytes += tam
+            while self.bytes > self.max_bytes:
+                self.bytes -= self._datos.popitem(last=False)[1][1]
+
+
+class CacheDisco:
+    """LRU shared by every worker process through a local SQLite file"""
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def _conexion(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            con = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("CREATE TABLE IF NOT EXISTS memo ("
+                        "clave TEXT PRIMARY KEY, valor BLOB, bytes INTEGER, usado REAL)")
+            con.execute("CREATE INDEX IF NOT EXISTS memo_usado ON memo (usado)")
+            self._local.con = con
+        return con
+
+    def obtener(self, clave):
+        con = self._conexion()
+        fila = con.execute("SELECT valor FROM memo WHERE clave = ?", (clave,)).fetchone()
+        if fila is None:
+            return None
+        con.execute("UPDATE memo SET usado = ? WHERE clave = ?", (time.time(), clave))
+        return fila[0]
+
+    def guardar(self, clave, datos):
+        if len(datos) > self.max_bytes:
+            return
+        con = self._conexion()
+        con.execute("INSERT OR REPLACE INTO memo VALUES (?, ?, ?, ?)",
+                    (clave, sqlite3.Binary(datos), len(datos), time.time()))
+        total = con.execute("SELECT COALESCE(SUM(bytes), 0) FROM memo").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        borrar = []
+        for viejo, tam in con.execute("SELECT clave, bytes FROM memo ORDER BY usado"):
+            if total <= self.max_bytes:
+                break
+            borrar.append((viejo,))
+            total -= tam
+        con.executemany("DELETE FROM memo WHERE clave = ?", borrar)
+
+
+# One budget per process (and one on disk) shared by every memo; keys already carry the memo name
+_memoria = CacheMemoria(MAX_BYTES)
+_disco = CacheDisco(MEMO_DB, MAX_BYTES)
+
+
+class Memo:
+    """Memoizes a callback on its normalized inputs with hit/miss counters.
+
+    Keyword arguments named in `ignorar` (e.g. a progress callback) are passed
+    through to the function but left out of the key.
+    """
+
+    def __init__(self, nombre, backend=BACKEND, ignorar=()):
+        self.nombre = nombre
+        self.ignorar = frozenset(ignorar)
+        self.memoria = _memoria
+        self.disco = _disco if backend == "disco" else None
+        self.aciertos = 0
+        self.fallos = 0
+        self._lock = threading.Lock()
+
+    def _contar(self, acierto):
+        # Callbacks run on several threads; += on an attribute is not atomic
+        with self._lock:
+            if acierto:
+                self.aciertos += 1
+            else:
+                self.fallos += 1
+
+    def clave(self, args, kwargs):
+        kwargs = {k: v for k, v in kwargs.items() if k not in self.ignorar}
+        crudo = pickle.dumps((self.nombre, normalizar(args), normalizar(kwargs)))
+        return hashlib.sha1(crudo).hexdigest()
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def envoltura(*args, **kwargs):
+            clave = self.clave(args, kwargs)
+            valor = self.memoria.obtener(clave)
+            if valor is not None:
+                self._contar(True)
+                return valor
+
+            if self.disco is not None:
+                try:
+                    datos = self.disco.obtener(clave)
+                except sqlite3.Error as e:
+                    print("Memo en disco no disponible:", e)
+                    datos = None
+                if datos is not None:
+                    self._contar(True)
+                    valor = pickle.loads(datos)
+                    self.memoria.guardar(clave, valor, len(datos))
+                    return valor
+
+            self._contar(False)
+            valor = func(*args, **kwargs)
+            datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+            self.memoria.guardar(clave, valor, len(datos))
+            if self.disco is not None:
+                try:
+                    self.disco.guardar(clave, datos)
+                except sqlite3.Error as e:
+                    print("Memo en disco no disponible:", e)
+            return valor
+
+        envoltura.memo = self
+        return envoltura
+
+    def estadisticas(self):
+        with self._lock:
+            aciertos, fallos = self.aciertos, self.fallos
+        total = aciertos + fallos
+        return {"aciertos": aciertos, "fallos": fallos,
+                "tasa_aciertos": aciertos / total if total else 0.0,
+                "bytes_memoria": self.memoria.bytes}
+
+
+def memoizar(nombre, **opciones):
+    memo = _memos[nombre] = Memo(nombre, **opciones)
+    return memo
+
+
+def estadisticas():
+    return {nombre: memo.estadisticas() for nombre, memo in _memos.items()}
@@ -0,0 +1,89 @@
+import numpy as np
+from dash import Input, Output, clientside_callback
+
+ANCHO_DEFECTO = 1200
+PUNTOS_POR_PIXEL = 2
+
+
+def lttb(x, y, n):
+    """Largest-Triangle-Three-Buckets: indices of n points that keep the visual shape of (x, y)"""
+    total = len(y)
+    if n >= total or n < 3:
+        return np.arange(total)
+
+    xf = np.asarray(x, dtype=float)
+    # Gaps (NaN) and unbounded values (e.g. an infinite doubling time) do not drive the selection
+    yf = np.nan_to_num(np.asarray(y, dtype=float), nan=0.0, posinf=0.0, neginf=0.0)
+    bordes = np.linspace(1, total - 1, n - 1).astype(int)
+    idx = np.empty(n, dtype=int)
+    idx[0], idx[-1] = 0, total - 1
+
+    a = 0
+    for k in range(n - 2):
+        ini, fin = bordes[k], bordes[k + 1]
+        sig_ini, sig_fin = fin, bordes[k + 2] if k + 2 < n - 1 else total
+        cx, cy = xf[sig_ini:sig_fin].mean(), yf[sig_ini:sig_fin].mean()
+        area = np.abs((xf[a] - cx) * (yf[ini:fin] - yf[a]) - (xf[a] - xf[ini:fin]) * (cy - yf[a]))
+        a = ini + int(np.argmax(area))
+        idx[k + 1] = a
+    return idx
+
+
+def minmax(y, n):
+    """Indices of the min and max of each of n/2 equal buckets, in order; cheaper than LTTB"""
+    total = len(y)
+    cubos = max(n // 2, 1)
+    if n >= total:
+        return np.arange(total)
+    largo = total // cubos
+    bloque = np.asarray(y[:largo * cubos], dtype=float).reshape(cubos, largo)
+    base = np.arange(cubos) * largo
+    idx = np.sort(np.column_stack([base + bloque.argmin(axis=1), base + bloque.argmax(axis=1)]), axis=1)
+    return np.unique(np.concatenate([idx.ravel(), [total - 1]]))
+
+
+def max_puntos(ancho):
+    return int((ancho or ANCHO_DEFECTO) * PUNTOS_POR_PIXEL)
+
+
+def reducir(x, ys, ancho, metodo="lttb"):
+    """Downsample x and every series in ys to the point budget of a graph ancho pixels wide"""
+    n = max_puntos(ancho)
+    if len(x) <= n:
+        return x, ys
+    xn = np.asarray(x).astype("datetime64[ns]").astype(float) if np.issubdtype(np.asarray(x).dtype, np.datetime64) else x
+    # Union of the indices chosen for each series keeps every trace's peaks on a shared x
+    idx = np.unique(np.concatenate([lttb(xn, y, n // len(ys)) if metodo == "lttb" else minmax(y, n // len(ys))
+                                    for y in ys]))
+    return np.asarray(x)[idx], [np.asarray(y)[idx] for y in ys]
+
+
+def ventana_x(relayout):
+    """Visible x range from relayoutData: (x0, x1), 'auto' when reset, or None if x did not change.
+
+    The {'autosize': True} relayout that every graph emits on first render
+    is not a reset; it leaves the already-downsampled figure as it is.
+    """
+    if not relayout:
+        return None
+    if relayout.get("xaxis.autorange"):
+        return "auto"
+    if "xaxis.range[0]" in relayout:
+        return relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    if "xaxis.range" in relayout:
+        return tuple(relayout["xaxis.range"])
+    return None
+
+
+def registrar_ancho(graph_id, store_id):
+    """Keep the rendered pixel width of a graph in a dcc.Store, refreshed on every relayout"""
+    clientside_callback(
+        f"""
+        function(_) {{
+            const el = document.getElementById("{graph_id}");
+            return el ? el.offsetWidth : window.dash_clientside.no_update;
+        }}
+        """,
+        Output(store_id, "data"),
+        Input(graph_id, "relayoutData")
+    )
@@ -0,0 +1,23 @@
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+
+def mapas_de_calor(x, y, paneles, titulo_x, titulo_y, separacion=0.1):
+    """One row of heatmaps over the same x/y, each colorbar placed just right of its own panel.
+
+    `paneles` holds (z, titulo, escala, hovertemplate) per panel; titles go
+    above the panels and axis titles on every x axis and the first y axis.
+    """
+    n = len(paneles)
+    fig = make_subplots(rows=1, cols=n, subplot_titles=[p[1] for p in paneles], horizontal_spacing=separacion)
+    ancho = (1 - (n - 1) * separacion) / n
+    for k, (z, _, escala, hovertemplate) in enumerate(paneles, start=1):
+        fig.add_trace(go.Heatmap(
+            x=x, y=y, z=z, colorscale=escala,
+            colorbar=dict(x=k * ancho + (k - 1) * separacion + 0.005, len=0.9, thickness=12),
+            hovertemplate=hovertemplate
+        ), row=1, col=k)
+        fig.update_xaxes(title_text=titulo_x, row=1, col=k)
+    fig.update_yaxes(title_text=titulo_y, row=1, col=1)
+    fig.update_layout(margin=dict(l=60, r=40, t=60, b=50))
+    return fig
@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(RAIZ, "cache")
+DATA_DIR = os.path.join(RAIZ, "data")
+REFERENCIA_DIR = os.path.join(CACHE_DIR, "referencia")
+
+# After a failed refresh, try again after this many seconds (or the dataset interval if shorter)
+REINTENTO = 300
+
+
+class Dataset:
+    """One slow-changing reference dataset: current value plus when and where it came from"""
+
+    def __init__(self, nombre, fetcher, intervalo):
+        self.nombre = nombre
+        self.fetcher = fetcher
+        self.intervalo = intervalo
+        self.path = os.path.join(REFERENCIA_DIR, f"{nombre}.json")
+        self.valor, self.actualizado, self.origen = self._cargar()
+        self.proximo = (self.actualizado or 0) + intervalo
+
+    def _cargar(self):
+        """Disk cache if present, else the snapshot bundled under data/"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                d = json.load(f)
+            return d["valor"], d["actualizado"], "cache"
+        except (OSError, ValueError, KeyError):
+            pass
+        with open(os.path.join(DATA_DIR, f"{self.nombre}.json"), encoding="utf-8") as f:
+            return json.load(f), None, "instantanea"
+
+    def _escribir(self):
+        os.makedirs(REFERENCIA_DIR, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"valor": self.valor, "actualizado": self.actualizado}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def refrescar(self):
+        """Fetch a new value; the fetcher raises on failure and the current value is kept"""
+        try:
+            valor = self.fetcher()
+            if not valor:
+                raise ValueError("respuesta vacía")
+        except Exception as e:
+            print(f"No se pudo refrescar {self.nombre}:", e)
+            self.proximo = time.time() + min(REINTENTO, self.intervalo)
+            return False
+        self.valor, self.actualizado, self.origen = valor, time.time(), "red"
+        self.proximo = self.actualizado + self.intervalo
+        try:
+            self._escribir()
+        except OSError as e:
+            # The new value is still served from memory; only the on-disk copy is behind
+            print(f"No se pudo guardar {self.nombre}:", e)
+        return True
+
+    def info(self):
+        return {"nombre": self.nombre, "origen": self.origen, "actualizado": self.actualizado,
+                "intervalo": self.intervalo}
+
+
+class Registro:
+    """Reference datasets read in O(1), refreshed by one background thread on per-dataset intervals"""
+
+    def __init__(self):
+        self._datasets = {}
+        self._despertar = threading.Event()
+        self._hilo = None
+        self._lock = threading.Lock()
+
+    def registrar(self, nombre, fetcher, intervalo):
+        with self._lock:
+            if nombre not in self._datasets:
+                self._datasets[nombre] = Dataset(nombre, fetcher, intervalo)
+            self._arrancar()
+        self._despertar.set()
+        return self._datasets[nombre]
+
+    def obtener(self, nombre):
+        return self._datasets[nombre].valor
+
+    def info(self):
+        return {nombre: ds.info() for nombre, ds in self._datasets.items()}
+
+    def _arrancar(self):
+        if os.environ.get("DASH_TM_SIN_RED"):
+            return
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._hilo = threading.Thread(target=self._bucle, name="referencia", daemon=True)
+        self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            self._despertar.clear()
+            for ds in list(self._datasets.values()):
+                if time.time() >= ds.proximo:
+                    ds.refrescar()
+            proximo = min(ds.proximo for ds in self._datasets.values())
+            self._despertar.wait(max(proximo - time.time(), 1.0))
+
+
+registro = Registro()
+
+
+def registrar(nombre, fetcher, intervalo):
+    """Register a dataset backed by data/<nombre>.json; refreshed with fetcher() every `intervalo` seconds"""
+    return registro.registrar(nombre, fetcher, intervalo)
+
+
+def obtener(nombre):
+    return registro.obtener(nombre)
@@ -0,0 +1,23 @@
+import numpy as np
+from scipy.special import lambertw
+
+
+def resumen_sir(beta, gamma, N, I0):
+    """Closed-form SIR summary (R0, peak infected, final size, herd-immunity threshold); broadcasts over arrays"""
+    beta, gamma = np.asarray(beta, dtype=float), np.asarray(gamma, dtype=float)
+    R0 = beta / gamma
+    s0, i0 = (N - I0) / N, I0 / N
+
+    # S-I invariant: i + s - ln(s)/R0 is conserved, and the peak happens at s = 1/R0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pico = np.where(R0 * s0 > 1, i0 + s0 - (1 + np.log(R0 * s0)) / R0, i0)
+
+    # Final size: s_inf = -W0(-R0 s0 exp(-R0 (s0 + i0))) / R0
+    s_inf = -np.real(lambertw(-R0 * s0 * np.exp(-R0 * (s0 + i0)))) / R0
+
+    return {
+        "R0": R0,
+        "pico": N * pico,
+        "final": 1 - s_inf,
+        "umbral": np.clip(1 - 1 / R0, 0, None)
+    }
@@ -0,0 +1,126 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+
+from utils.compartimentos import SEIR, SIR
+from utils.referencia import CACHE_DIR
+
+TABLAS_DIR = os.path.join(CACHE_DIR, "tablas")
+
+
+def rejilla(inicio, fin, paso):
+    return np.round(np.arange(inicio, fin + paso / 2, paso), 10)
+
+
+TABLAS = {
+    "sir": {
+        "modelo": SIR,
+        "ejes": {"beta": rejilla(0.1, 1.0, 0.05), "gamma": rejilla(0.05, 0.5, 0.05)},
+        "N": 1000, "y0": [990, 10, 0], "t": (0, 160, 400)
+    },
+    "seir": {
+        "modelo": SEIR,
+        # 0.33 is the clase6 slider default, which is off the 0.05 steps
+        "ejes": {"beta": rejilla(0.1, 1.0, 0.05), "sigma": np.union1d(rejilla(0.1, 1.0, 0.05), [0.33]),
+                 "gamma": rejilla(0.05, 0.5, 0.05)},
+        "N": 1000, "y0": [990, 10, 0, 0], "t": (0, 200, 500)
+    }
+}
+
+_abiertas = {}
+
+
+def _firma(nombre):
+    d = TABLAS[nombre]
+    texto = json.dumps({"modelo": d["modelo"].descripcion, "N": d["N"], "y0": d["y0"], "t": d["t"],
+                        "ejes": {k: v.tolist() for k, v in d["ejes"].items()}})
+    return hashlib.sha256(texto.encode()).hexdigest()[:16]
+
+
+def _paths(nombre):
+    return os.path.join(TABLAS_DIR, f"{nombre}.npy"), os.path.join(TABLAS_DIR, f"{nombre}.json")
+
+
+def precalcular(nombre):
+    """Solve every grid combination of one table and write it as a float32 .npy"""
+    d = TABLAS[nombre]
+    modelo, ejes = d["modelo"], d["ejes"]
+    t = np.linspace(*d["t"])
+    forma = tuple(len(v) for v in ejes.values()) + (len(modelo.compartimentos), len(t))
+
+    os.makedirs(TABLAS_DIR, exist_ok=True)
+    npy, meta = _paths(nombre)
+    tmp = f"{npy}.{os.getpid()}.tmp"
+    tabla = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=forma)
+    for idx in itertools.product(*(range(len(v)) for v in ejes.values())):
+        params = {p: v[i] for (p, v), i in zip(ejes.items(), idx)}
+        tabla[idx] = modelo.resolver(d["y0"], t, d["N"], **params)
+    tabla.flush()
+    del tabla
+    os.replace(tmp, npy)
+    with open(meta, "w", encoding="utf-8") as f:
+        json.dump({"firma": _firma(nombre), "forma": forma}, f)
+
+
+def _abrir(nombre):
+    """The table's memmap, reopened when its metadata file changes; None while it is missing or stale"""
+    npy, meta = _paths(nombre)
+    try:
+        mtime = os.stat(meta).st_mtime_ns
+    except OSError:
+        _abiertas.pop(nombre, None)
+        return None
+    if nombre not in _abiertas or _abiertas[nombre][0] != mtime:
+        try:
+            with open(meta, encoding="utf-8") as f:
+                ok = json.load(f)["firma"] == _firma(nombre)
+            tabla = np.load(npy, mmap_mode="r") if ok else None
+        except (OSError, ValueError, KeyError):
+            tabla = None
+        _abiertas[nombre] = (mtime, tabla)
+    return _abiertas[nombre][1]
+
+
+def buscar(nombre, y0, t, N, **params):
+    """Memory-mapped slice for an on-grid parameter set, or None"""
+    d = TABLAS[nombre]
+    if N != d["N"] or list(y0) != d["y0"] or len(t) != d["t"][2] or t[0] != d["t"][0] or t[-1] != d["t"][1]:
+        return None
+    idx = []
+    for p, valores in d["ejes"].items():
+        i = int(np.argmin(np.abs(valores - params[p])))
+        if abs(valores[i] - params[p]) > 1e-9:
+            return None
+        idx.append(i)
+    tabla = _abrir(nombre)
+    return None if tabla is None else np.asarray(tabla[tuple(idx)])
+
+
+def resolver(nombre, y0, t, N, **params):
+    """Table lookup with the ODE solver as fallback for off-grid values"""
+    sol = buscar(nombre, y0, t, N, **params)
+    if sol is None:
+        sol = TABLAS[nombre]["modelo"].resolver(y0, t, N, **params)
+    return sol
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precalcula las tablas de soluciones SIR/SEIR")
+    parser.add_argument("tablas", nargs="*", help=f"entre {', '.join(TABLAS)}; por defecto, todas")
+    args = parser.parse_args(argv)
+    desconocidas = set(args.tablas) - set(TABLAS)
+    if desconocidas:
+        parser.error(f"tablas desconocidas: {', '.join(sorted(desconocidas))}")
+    for nombre in args.tablas or TABLAS:
+        t0 = time.perf_counter()
+        precalcular(nombre)
+        print(f"{nombre}: {os.path.getsize(_paths(nombre)[0]) / 2**20:.1f} MiB en {time.perf_counter() - t0:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from dash import Input, Output, State, callback, dcc, html, no_update
+
+from utils.memo import normalizar
+from utils.referencia import CACHE_DIR
+
+POOL = int(os.environ.get("DASH_TM_TRABAJOS", 2))
+TRABAJOS_DB = os.path.join(CACHE_DIR, "trabajos.sqlite")
+# Finished jobs are kept (and reused by identical requests) for this long
+RETENCION = 3600
+# A running job that has not reported for this long is assumed dead with its process.
+# Pending jobs are exempt: they may wait that long behind a busy pool.
+LATIDO = 120
+INTERVALO_ESCRITURA = 0.25
+
+ACTIVOS = ("pendiente", "corriendo")
+
+
+class Cancelado(Exception):
+    """Raised from a job's progress callback once the job has been cancelled"""
+
+
+class Trabajo:
+    """Snapshot of one job row"""
+
+    def __init__(self, id_trabajo, estado, progreso, mensaje, error, resultado):
+        self.id = id_trabajo
+        self.estado = estado
+        self.progreso = progreso
+        self.mensaje = mensaje
+        self.error = error
+        self._resultado = resultado
+
+    @property
+    def resultado(self):
+        return pickle.loads(self._resultado) if self._resultado is not None else None
+
+    def como_dict(self):
+        return {"id": self.id, "estado": self.estado, "progreso": self.progreso,
+                "mensaje": self.mensaje, "error": self.error}
+
+
+class AlmacenTrabajos:
+    """Job states, progress and results in a local SQLite file, visible to every worker process"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _conexion(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            con = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("CREATE TABLE IF NOT EXISTS trabajos ("
+                        "id TEXT PRIMARY KEY, clave TEXT, estado TEXT, progreso REAL, mensaje TEXT, "
+                        "error TEXT, resultado BLOB, cancelar INTEGER DEFAULT 0, actualizado REAL, pid INTEGER)")
+            con.execute("CREATE INDEX IF NOT EXISTS trabajos_clave ON trabajos (clave)")
+            self._local.con = con
+        return con
+
+    def crear(self, clave):
+        """(id, nuevo): an in-flight or recently finished job with the same key, or a fresh pending one"""
+        con = self._conexion()
+        ahora = time.time()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            con.execute("DELETE FROM trabajos WHERE actualizado < ?", (ahora - RETENCION,))
+            con.execute("UPDATE trabajos SET estado = 'error', error = 'proceso interrumpido' "
+                        "WHERE estado = 'corriendo' AND actualizado < ?", (ahora - LATIDO,))
+            # A pending job is only joined from the process whose pool holds it; one left
+            # behind by a dead process is never picked up and ages out with RETENCION
+            fila = con.execute("SELECT id FROM trabajos WHERE clave = ? AND cancelar = 0 "
+                               "AND (estado IN ('corriendo', 'listo') OR (estado = 'pendiente' AND pid = ?)) "
+                               "ORDER BY actualizado DESC LIMIT 1", (clave, os.getpid())).fetchone()
+            if fila is not None:
+                con.execute("COMMIT")
+                return fila[0], False
+            id_trabajo = uuid.uuid4().hex
+            con.execute("INSERT INTO trabajos (id, clave, estado, progreso, mensaje, actualizado, pid) "
+                        "VALUES (?, ?, 'pendiente', 0, '', ?, ?)", (id_trabajo, clave, ahora, os.getpid()))
+            con.execute("COMMIT")
+            return id_trabajo, True
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    def actualizar(self, id_trabajo, **campos):
+        campos["actualizado"] = time.time()
+        asignaciones = ", ".join(f"{k} = ?" for k in campos)
+        self._conexion().execute(f"UPDATE trabajos SET {asignaciones} WHERE id = ?", (*campos.values(), id_trabajo))
+
+    def obtener(self, id_trabajo):
+        fila = self._conexion().execute("SELECT id, estado, progreso, mensaje, error, resultado FROM trabajos "
+                                        "WHERE id = ?", (id_trabajo,)).fetchone()
+        return Trabajo(*fila) if fila else None
+
+    def cancelar(self, id_trabajo):
+        self._conexion().execute(
+            "UPDATE trabajos SET cancelar = 1, estado = CASE WHEN estado = 'pendiente' THEN 'cancelado' ELSE estado END, "
+            "actualizado = ? WHERE id = ? AND estado IN (?, ?)", (time.time(), id_trabajo) + ACTIVOS)
+
+    def cancelado(self, id_trabajo):
+        fila = self._conexion().execute("SELECT cancelar FROM trabajos WHERE id = ?", (id_trabajo,)).fetchone()
+        return fila is None or bool(fila[0])
+
+
+almacen = AlmacenTrabajos(TRABAJOS_DB)
+_pool = ThreadPoolExecutor(max_workers=POOL, thread_name_prefix="trabajo")
+
+
+def clave(func, args, kwargs):
+    crudo = pickle.dumps((func.__module__, func.__qualname__, normalizar(args), normalizar(kwargs)))
+    return hashlib.sha1(crudo).hexdigest()
+
+
+def _ejecutar(id_trabajo, func, args, kwargs):
+    if almacen.cancelado(id_trabajo):
+        almacen.actualizar(id_trabajo, estado="cancelado")
+        return
+    almacen.actualizar(id_trabajo, estado="corriendo")
+    ultima = [0.0]
+
+    def informar(progreso, mensaje=""):
+        # Throttled so tight solver loops do not turn into a stream of SQLite writes
+        ahora = time.monotonic()
+        if ahora - ultima[0] < INTERVALO_ESCRITURA:
+            return
+        ultima[0] = ahora
+        if almacen.cancelado(id_trabajo):
+            raise Cancelado(id_trabajo)
+        almacen.actualizar(id_trabajo, progreso=min(max(float(progreso), 0.0), 1.0), mensaje=mensaje)
+
+    try:
+        resultado = func(*args, progreso=informar, **kwargs)
+        almacen.actualizar(id_trabajo, estado="listo", progreso=1.0, mensaje="",
+                           resultado=sqlite3.Binary(pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL)))
+    except Cancelado:
+        almacen.actualizar(id_trabajo, estado="cancelado")
+    except Exception as e:
+        traceback.print_exc()
+        almacen.actualizar(id_trabajo, estado="error", error=str(e))
+
+
+def lanzar(func, *args, reemplaza=None, **kwargs):
+    """Run func(*args, progreso=callback, **kwargs) on the job pool and return the job id.
+
+    An identical job that is still running or finished recently is reused
+    instead of started again. `reemplaza` is the id of the job this one
+    supersedes (e.g. from the previous inputs); it is cancelled unless it is
+    the very job being reused.
+    """
+    id_trabajo, nuevo = almacen.crear(clave(func, args, kwargs))
+    if reemplaza and reemplaza != id_trabajo:
+        almacen.cancelar(reemplaza)
+    if nuevo:
+        _pool.submit(_ejecutar, id_trabajo, func, args, kwargs)
+    return id_trabajo
+
+
+def consultar(id_trabajo):
+    """The job with that id, or None if it is unknown or expired"""
+    return almacen.obtener(id_trabajo) if id_trabajo else None
+
+
+def cancelar(id_trabajo):
+    if id_trabajo:
+        almacen.cancelar(id_trabajo)
+
+
+def describir(trabajo):
+    """Status line for a job as shown next to its progress bar"""
+    if trabajo is None:
+        return "El cálculo ya no está disponible; vuelve a lanzarlo."
+    if trabajo.estado in ACTIVOS:
+        return f"Calculando… {trabajo.mensaje}".rstrip()
+    return {"listo": "Cálculo terminado.", "cancelado": "Cálculo cancelado.",
+            "error": f"Error: {trabajo.error}"}[trabajo.estado]
+
+
+def componentes(prefijo, intervalo=400, clase="context-viva"):
+    """Progress bar and status line for one job, plus the hidden Interval and Store that track it.
+
+    Ids are <prefijo>-progreso, -estado, -intervalo and -trabajo; the
+    launching callback writes the job id to -trabajo and enables -intervalo.
+    """
+    return [html.Progress(id=f"{prefijo}-progreso", value="0", max="100", style={"width": "100%"}),
+            html.Div(id=f"{prefijo}-estado", className=clase),
+            dcc.Interval(id=f"{prefijo}-intervalo", interval=intervalo, disabled=True),
+            dcc.Store(id=f"{prefijo}-trabajo")]
+
+
+def registrar_sondeo(prefijo, salida, al_terminar):
+    """Poll the job in <prefijo>-trabajo on every interval tick until it ends.
+
+    While it runs, the progress bar and status line follow it. When it
+    finishes, al_terminar(resultado) returns (value for `salida`, status
+    text) and the interval is switched off.
+    """
+    @callback(
+        Output(f"{prefijo}-progreso", "value"),
+        Output(f"{prefijo}-estado", "children"),
+        salida,
+        Output(f"{prefijo}-intervalo", "disabled", allow_duplicate=True),
+        Input(f"{prefijo}-intervalo", "n_intervals"),
+        State(f"{prefijo}-trabajo", "data"),
+        prevent_initial_call=True
+    )
+    def sondear(_, id_trabajo):
+        trabajo = consultar(id_trabajo)
+        texto = describir(trabajo)
+        if trabajo is not None and trabajo.estado in ACTIVOS:
+            return f"{100 * trabajo.progreso:.0f}", texto, no_update, False
+        if trabajo is None or trabajo.estado != "listo":
+            return "0", texto, no_update, True
+        valor, texto = al_terminar(trabajo.resultado)
+        return "100", texto, valor, True
+
+    return sondear